@@ -1,46 +1,9 @@
-import streamlit as st
-import json
-from utils.leetcodeapi import fetch_user_data
 import os
-import pandas as pd
-import plotly.express as px
-from utils.auth import login, register, get_current_user
-
-# Constants
-DATA_PATH = "data/members.json"
-
-# Load all teams/members data
-def load_all_members():
-    if not os.path.exists(DATA_PATH):
-        return {}
-    with open(DATA_PATH, "r") as f:
-        return json.load(f)
-
-# Save all teams/members data
-def save_all_members(all_members):
-    with open(DATA_PATH, "w") as f:
-        json.dump(all_members, f, indent=4)
-
-# Get current user's members
-def load_members(user):
-    all_members = load_all_members()
-    return all_members.get(user, [])
-
-def save_members(user, members):
-    all_members = load_all_members()
-    all_members[user] = members
-    save_all_members(all_members)
-
-# Fetch all members data
-@st.cache_data
-def fetch_all_data(members):
-    data = []
-    for member in members:
-        user_data = fetch_user_data(member["username"])
-        if user_data:
-            user_data["name"] = member.get("name", member["username"])
-            data.append(user_data)
-    return data
+import streamlit as st
+from utils.refresher import start_refresher
+import time
+from utils import metrics
+from utils.auth import login, register, get_current_user, start_session, end_session
 
 # Streamlit page setup
 st.set_page_config(
@@ -48,306 +11,122 @@ st.set_page_config(
     page_title="LeetCode Team Dashboard",
     page_icon="📊"
 )
+metrics.begin_run()
 
-# Dynamic theme-aware CSS
-st.markdown("""
-    <style>
-    /* CSS Variables for both themes */
-    :root {
-        --leetcode-orange: #FFA116;
-        --leetcode-green: #34A853;
-        --leetcode-red: #EF4743;
-        --leetcode-blue: #1E88E5;
-    }
-    
-    /* Dark theme variables */
-    [data-theme="dark"] {
-        --bg-primary: #0E1117;
-        --bg-secondary: #262730;
-        --bg-card: #1E1E1E;
-        --text-primary: #FAFAFA;
-        --text-secondary: #A0A0A0;
-        --border-color: #333333;
-        --hover-bg: #2A2A2A;
-    }
-    
-    /* Light theme variables */
-    [data-theme="light"] {
-        --bg-primary: #FFFFFF;
-        --bg-secondary: #F0F2F6;
-        --bg-card: #FFFFFF;
-        --text-primary: #262730;
-        --text-secondary: #6C757D;
-        --border-color: #E0E0E0;
-        --hover-bg: #F8F9FA;
-    }
-    
-    /* Auto-detect theme based on Streamlit's theme */
-    @media (prefers-color-scheme: dark) {
-        :root {
-            --bg-primary: #0E1117;
-            --bg-secondary: #262730;
-            --bg-card: #1E1E1E;
-            --text-primary: #FAFAFA;
-            --text-secondary: #A0A0A0;
-            --border-color: #333333;
-            --hover-bg: #2A2A2A;
-        }
-    }
-    
-    @media (prefers-color-scheme: light) {
-        :root {
-            --bg-primary: #FFFFFF;
-            --bg-secondary: #F0F2F6;
-            --bg-card: #FFFFFF;
-            --text-primary: #262730;
-            --text-secondary: #6C757D;
-            --border-color: #E0E0E0;
-            --hover-bg: #F8F9FA;
-        }
-    }
-    
-    /* Override Streamlit's default styles */
-    .stApp {
-        background-color: var(--bg-primary) !important;
-    }
-    
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Header styling */
-    .header-title {
-        color: var(--leetcode-orange) !important;
-        font-weight: 700;
-        font-size: 2.5rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 3px solid #FFA116;
-        margin-bottom: 1.5rem;
-        text-align: center;
-    }
-    
-    /* Card styling */
-    .leetcode-card {
-        background: var(--bg-card) !important;
-        border-radius: 12px;
-        border: 1px solid var(--border-color);
-        padding: 1.5rem;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* Profile header */
-    .profile-header {
-        background: linear-gradient(135deg, var(--bg-card) 0%, var(--bg-secondary) 100%);
-        border-radius: 12px;
-        padding: 1.5rem;
-        color: var(--text-primary);
-        margin-bottom: 1.5rem;
-        border: 1px solid var(--border-color);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-    }
-    
-    /* Badges */
-    .rank-badge {
-        background: var(--leetcode-orange);
-        color: white;
-        border-radius: 20px;
-        padding: 4px 12px;
-        font-weight: 600;
-        display: inline-block;
-        font-size: 0.9rem;
-    }
-    .solved-badge {
-        background: var(--leetcode-green);
-        color: white;
-        border-radius: 20px;
-        padding: 4px 12px;
-        font-weight: 600;
-        display: inline-block;
-        font-size: 0.9rem;
-    }
-    
-    /* Leaderboard items */
-    .leaderboard-item {
-        transition: all 0.3s ease;
-        border-radius: 8px;
-        padding: 12px;
-        margin-bottom: 8px;
-        background: var(--bg-card);
-        border: 1px solid var(--border-color);
-        cursor: pointer;
-    }
-    
-    .leaderboard-item:hover {
-        background: var(--hover-bg);
-        transform: translateX(5px);
-        box-shadow: 0 2px 8px rgba(0,0,0,0.15);
-    }
-    .leaderboard-item.selected {
-        background: rgba(255, 161, 22, 0.15);
-        border-left: 4px solid var(--leetcode-orange);
-    }
-    
-    /* Stats cards */
-    .stats-container {
-        display: flex;
-        justify-content: space-between;
-        flex-wrap: wrap;
-        gap: 1rem;
-        margin-bottom: 1.5rem;
-    }
-    .stat-card {
-        background: var(--bg-card);
-        border-radius: 10px;
-        padding: 1.2rem;
-        text-align: center;
-        flex: 1;
-        min-width: 120px;
-        border: 1px solid var(--border-color);
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        transition: transform 0.2s ease;
-    }
-    
-    .stat-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-    }
-    
-    .stat-value {
-        font-size: 1.8rem;
-        font-weight: 700;
-        margin: 0.5rem 0;
-        color: var(--text-primary);
-    }
-    .stat-label {
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-        font-weight: 500;
-    }
-    
-    /* Difficulty colors */
-    .difficulty-easy { color: var(--leetcode-green) !important; font-weight: 700; }
-    .difficulty-medium { color: var(--leetcode-orange) !important; font-weight: 700; }
-    .difficulty-hard { color: var(--leetcode-red) !important; font-weight: 700; }
-    
-    /* Text colors */
-    .stMarkdown, .stText {
-        color: var(--text-primary) !important;
-    }
-    
-    .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
-        color: var(--text-primary) !important;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background-color: var(--leetcode-orange) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 8px !important;
-        font-weight: 600 !important;
-        padding: 8px 16px !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stButton > button:hover {
-        background-color: #e69115 !important;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    
-    /* Input styling */
-    .stTextInput > div > div > input {
-        background-color: var(--bg-card) !important;
-        color: var(--text-primary) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: 8px !important;
-    }
-    
-    .stSelectbox > div > div > div {
-        background-color: var(--bg-card) !important;
-        color: var(--text-primary) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Expander styling */
-    .streamlit-expanderHeader {
-        background-color: var(--bg-card) !important;
-        color: var(--text-primary) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    .streamlit-expanderContent {
-        background-color: var(--bg-card) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Progress bar */
-    .stProgress > div > div > div {
-        background-color: var(--leetcode-orange) !important;
-    }
-    
-    /* Welcome message */
-    .welcome-message {
-        color: var(--text-primary) !important;
-        font-size: 1.2rem;
-        margin-bottom: 1rem;
-    }
-    
-    .welcome-username {
-        color: var(--leetcode-green) !important;
-        font-weight: 600;
-    }
-    
-    /* Login card */
-    .login-card {
-        background: var(--bg-card);
-        border-radius: 12px;
-        border: 1px solid var(--border-color);
-        padding: 2rem;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    }
-    
-    .login-title {
-        text-align: center;
-        color: var(--leetcode-orange);
-        margin-bottom: 2rem;
-        font-size: 1.5rem;
-        font-weight: 600;
-    }
-    
-    /* Hide Streamlit elements */
-    footer {visibility: hidden;}
-    #MainMenu {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Responsive design */
-    @media (max-width: 768px) {
-        .header-title {
-            font-size: 2rem;
-        }
-        
-        .stats-container {
-            flex-direction: column;
-        }
-        
-        .stat-card {
-            min-width: 100%;
-        }
-    }
-    </style>
-""", unsafe_allow_html=True)
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "dashboard.css")
+CSS_URL = "app/static/dashboard.css"
+
+# Leaderboard rows rendered per page; rendering cost scales with this, not team size
+LEADERBOARD_PAGE_SIZES = [10, 20, 50, 100]
+DEFAULT_PAGE_SIZE = 20
+# Minimum seconds between loading-preview redraws while members stream in
+PREVIEW_INTERVAL = 0.3
+
+def reset_leaderboard_page():
+    st.session_state.lb_page = 1
+
+# Streams the team in: cached members are ready at once, and while the rest
+# load a preview (n of N, top members and the team chart) is redrawn as each
+# profile arrives, then cleared before the full page renders. Returns
+# (rows, members still missing).
+def stream_team(members):
+    total = len({m["username"] for m in members})
+    rows = {}
+    statuses = {}
+    loading = 0
+    preview = st.empty()
+    drawn = None
+    for username, row, status in iter_all_data(members, team=user):
+        if statuses.get(username) == "loading":
+            loading -= 1
+        if status == "loading":
+            loading += 1
+        statuses[username] = status
+        if row is not None:
+            rows[username] = row
+        # Draw once every member is announced (fetching has begun), then throttle
+        if not loading or len(statuses) < total or (drawn and time.monotonic() - drawn[0] < PREVIEW_INTERVAL):
+            continue
+        drawn = (time.monotonic(), (drawn[1] + 1) if drawn else 0)
+        top = heapq.nlargest(charts.TEAM_BAR_TOP_N, rows.values(), key=lambda r: r["totalSolved"])
+        with preview.container():
+            st.progress((total - loading) / total, text=f"⏳ Loaded {total - loading} of {total} members")
+            if top:
+                st.dataframe(
+                    pd.DataFrame({
+                        "Member": [r["name"] for r in top],
+                        "Solved": [r["totalSolved"] for r in top],
+                        "Status": ["loading" if statuses[r["username"]] == "loading" else "ready" for r in top],
+                    }),
+                    hide_index=True, use_container_width=True, key=f"preview_table_{drawn[1]}"
+                )
+                st.plotly_chart(charts.team_bar(top), use_container_width=True, key=f"preview_chart_{drawn[1]}")
+    preview.empty()
+    ordered = [rows[u] for u in dict.fromkeys(m["username"] for m in members) if u in rows]
+    missing = [u for u, status in statuses.items() if u not in rows and status == "timeout"]
+    return ordered, missing
+
+# Sidebar timings for this process, which cover every user's requests; only
+# shown when DASHBOARD_METRICS=1, and only to ORG_ADMINS
+def performance_panel(user):
+    metrics.end_run()
+    if not metrics.ENABLED or user not in ORG_ADMINS:
+        return
+    data = metrics.snapshot()
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        rows = []
+        for name, histogram in sorted(data["histograms"].items()):
+            p50 = metrics.quantile(histogram, 0.5)
+            p95 = metrics.quantile(histogram, 0.95)
+            rows.append({
+                "stage": name,
+                "count": histogram["count"],
+                "mean ms": round(1000 * histogram["sum"] / histogram["count"], 1),
+                "p50 ≤ ms": None if p50 in (None, float("inf")) else 1000 * p50,
+                "p95 ≤ ms": None if p95 in (None, float("inf")) else 1000 * p95,
+            })
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        counters = {**data["counters"], **data["gauges"]}
+        if counters:
+            st.dataframe(
+                pd.DataFrame(sorted(counters.items()), columns=["metric", "value"]),
+                hide_index=True,
+                use_container_width=True
+            )
+        st.download_button(
+            "📥 Prometheus metrics",
+            metrics.prometheus_text(),
+            file_name="metrics.prom",
+            mime="text/plain"
+        )
+
+# One background refresher per server process keeps cached profiles warm
+# so page loads read precomputed data instead of waiting on LeetCode.
+@st.cache_resource
+def background_refresher():
+    return start_refresher()
+
+background_refresher()
+
+# Dynamic theme-aware CSS. With static serving (.streamlit/config.toml) each
+# rerun sends a one-line <link> and the browser caches the stylesheet;
+# otherwise the file is inlined, read from disk once per server process.
+@st.cache_resource
+def dashboard_css():
+    if st.get_option("server.enableStaticServing"):
+        return f'<link rel="stylesheet" href="{CSS_URL}">'
+    with open(CSS_PATH, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.markdown(dashboard_css(), unsafe_allow_html=True)
 
 # --- Page Header ---
 st.markdown('<div class="header-title">👨🏼‍💻 LeetCode Team Dashboard</div>', unsafe_allow_html=True)
 
 # --- Authentication Section ---
-if "user" not in st.session_state:
-    st.session_state.user = None
-
-if st.session_state.user is None:
+# Reruns only check the session token's signature, never the password
+if get_current_user(st.session_state) is None:
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -365,7 +144,7 @@ if st.session_state.user is None:
         if login_clicked:
             if username and password:
                 if login(username, password):
-                    st.session_state.user = username
+                    start_session(st.session_state, username)
                     st.success("✅ Logged in successfully!")
                     st.rerun()
                 else:
@@ -376,7 +155,7 @@ if st.session_state.user is None:
         if register_clicked:
             if username and password:
                 if register(username, password):
-                    st.session_state.user = username
+                    start_session(st.session_state, username)
                     st.success("✅ Registered and logged in!")
                     st.rerun()
                 else:
@@ -389,6 +168,18 @@ if st.session_state.user is None:
 
 user = st.session_state.user
 
+# Dashboard-only modules are imported past the login gate so the login page
+# never pays for pandas and plotly.
+import heapq
+import pandas as pd
+from utils.cache import get_user_data, iter_all_data
+from utils.storage import add_member, load_members, remove_member
+from utils.onboarding import onboard_members, parse_members
+from utils import activity, charts, problems, snapshots
+from utils.leaderboard import build_leaderboard, filter_rows, paginate
+from utils.avatars import avatar_data_uri, avatar_data_uris
+from utils.org import ORG_ADMINS, anonymize, load_org_frame, org_rollups
+
 # --- Welcome Message ---
 st.markdown(
     f'<div class="welcome-message">👋 Welcome, <span class="welcome-username">{user}</span>!</div>',
@@ -399,15 +190,132 @@ st.markdown(
 top_cols = st.columns([8, 1])
 with top_cols[1]:
     if st.button("🚪 Logout", key="logout_btn"):
-        st.session_state.user = None
+        end_session(st.session_state)
         st.session_state.selected_user = None
         st.rerun()
 
+# --- View Switch ---
+view = st.radio("View", ["👥 My Team", "🏢 Organization", "🧩 Problems"], horizontal=True, label_visibility="collapsed")
+
+if view == "🏢 Organization":
+    org_frame = load_org_frame()
+    if org_frame.empty:
+        st.info("ℹ️ No cached team data yet.")
+        st.stop()
+    team_stats, org_members = org_rollups(org_frame)
+    if user not in ORG_ADMINS:
+        team_stats, org_members = anonymize(team_stats, org_members, user)
+    
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Teams", len(team_stats))
+    metric_cols[1].metric("Members", len(org_members))
+    metric_cols[2].metric("Total Solved", int(team_stats["totalSolved"].sum()))
+    metric_cols[3].metric("Median per Member", int(org_members["totalSolved"].median()))
+    
+    own_team = team_stats[team_stats["team"] == user]
+    if not own_team.empty:
+        st.markdown(
+            f'<div class="welcome-message">🏅 Your team ranks <span class="welcome-username">'
+            f'#{int(own_team.iloc[0]["rank"])}</span> of {len(team_stats)}</div>',
+            unsafe_allow_html=True
+        )
+    
+    st.markdown("### 🏢 Team Comparison")
+    st.dataframe(
+        team_stats[["rank", "team", "members", "totalSolved", "median", "p25", "p75", "p90",
+                    "easyShare", "mediumShare", "hardShare"]],
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    # Difficulty mix for the top teams
+    mix_fig = charts.difficulty_mix(team_stats.head(30))
+    st.plotly_chart(mix_fig, use_container_width=True)
+    
+    st.markdown("### 🌍 Organization Leaderboard")
+    st.dataframe(
+        org_members.head(100)[["orgRank", "name", "team", "totalSolved", "easy", "medium", "hard", "percentile"]],
+        hide_index=True,
+        use_container_width=True
+    )
+    performance_panel(user)
+    st.stop()
+
 # Load member list for current user/team
 members = load_members(user)
 if not members:
     st.warning("⚠️ No members found for your team.")
 
+if view == "🧩 Problems":
+    if not members:
+        st.stop()
+    names = {m["username"]: m.get("name", m["username"]) for m in members}
+    with metrics.timed("problem_index"):
+        index = problems.build_index(names)
+    team_solved, known = problems.coverage(index)
+    if not team_solved:
+        st.info("🧩 Solved problems will appear after the next background activity sync.")
+        performance_panel(user)
+        st.stop()
+    
+    metric_cols = st.columns(3)
+    metric_cols[0].metric("Solved by the Team", team_solved)
+    metric_cols[1].metric("Known Problems", known)
+    metric_cols[2].metric("Coverage", f"{team_solved / known:.0%}")
+    st.caption("Based on accepted submissions synced since each member joined the dashboard.")
+    
+    topic_rows = problems.coverage_by_topic(index)
+    if topic_rows:
+        st.markdown("### 📚 Coverage by Topic")
+        st.dataframe(
+            pd.DataFrame(
+                [(t, c, n, c / n if n else 0.0) for t, c, n in topic_rows],
+                columns=["Topic", "Solved", "Problems", "Coverage"]
+            ),
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Coverage": st.column_config.ProgressColumn(min_value=0, max_value=1, format="percent")}
+        )
+    
+    def problem_link(problem_id):
+        slug, _frontend_id, title, _difficulty, _topics = problems.describe(index, problem_id)
+        return f"[{title}](https://leetcode.com/problems/{slug}/)"
+    
+    if len(names) > 1:
+        st.markdown("### 🤝 Overlap")
+        pair_cols = st.columns(2)
+        member_a = pair_cols[0].selectbox("Member", list(names), format_func=names.get, key="overlap_a")
+        member_b = pair_cols[1].selectbox("Compared with", [u for u in names if u != member_a],
+                                          format_func=names.get, key="overlap_b")
+        shared = problems.overlap(index, member_a, member_b)
+        overlap_cols = st.columns(3)
+        overlap_cols[0].metric("Both solved", shared["both"])
+        overlap_cols[1].metric(f"Only {names[member_a]}", shared["only_a"])
+        overlap_cols[2].metric(f"Only {names[member_b]}", shared["only_b"])
+    
+    st.markdown("### 🎯 Recommendations")
+    rec_cols = st.columns(3)
+    member = rec_cols[0].selectbox("For", list(names), format_func=names.get, key="rec_member")
+    topic = rec_cols[1].selectbox("Topic", ["All topics"] + [t for t, _c, _n in topic_rows], key="rec_topic")
+    difficulty = rec_cols[2].selectbox("Difficulty", ["Any", "Easy", "Medium", "Hard"], key="rec_difficulty")
+    topic = None if topic == "All topics" else topic
+    difficulty = None if difficulty == "Any" else difficulty
+    recommended = problems.recommend(index, member, topic, difficulty, limit=10)
+    if recommended:
+        for problem_id, teammates in recommended:
+            _slug, _frontend_id, _title, level, topics = problems.describe(index, problem_id)
+            solved_by = f" • solved by {teammates} teammate{'s' if teammates != 1 else ''}" if teammates else ""
+            st.markdown(f"- {problem_link(problem_id)} • {level or '—'} • {', '.join(topics) or '—'}{solved_by}")
+    else:
+        st.info("🎉 Nothing left to recommend for this filter.")
+    
+    gap_ids = problems.gaps(index, topic=topic, difficulty=difficulty)
+    st.markdown(f"### 🕳️ Team Gaps ({len(gap_ids)} unsolved by everyone)")
+    if gap_ids:
+        st.markdown(" • ".join(problem_link(problem_id) for problem_id in gap_ids[:20]))
+    performance_panel(user)
+    st.stop()
+
 # ➕➖ Add / Remove Members
 with st.expander("📝 Manage Team Members", expanded=False):
     col1, col2 = st.columns(2)
@@ -425,12 +333,13 @@ with st.expander("📝 Manage Team Members", expanded=False):
                 st.warning("⚠️ Member already exists.")
             else:
                 with st.spinner("🔍 Verifying LeetCode user..."):
-                    user_data = fetch_user_data(new_username)
+                    user_data = get_user_data(new_username, team=user)
                     if user_data:
-                        members.append({"name": new_name, "username": new_username})
-                        save_members(user, members)
-                        st.success(f"✅ Member '{new_name}' added successfully!")
-                        st.rerun()
+                        if add_member(user, new_name, new_username):
+                            st.success(f"✅ Member '{new_name}' added successfully!")
+                            st.rerun()
+                        else:
+                            st.warning("⚠️ Member already exists.")
                     else:
                         st.error("❌ User not found on LeetCode.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -443,65 +352,164 @@ with st.expander("📝 Manage Team Members", expanded=False):
             selected_name = st.selectbox("Select a member to remove", list(name_to_username.keys()))
             if st.button("🗑️ Remove Member", key="remove_member_btn", use_container_width=True):
                 selected_username = name_to_username[selected_name]
-                members = [m for m in members if m["username"] != selected_username]
-                save_members(user, members)
+                remove_member(user, selected_username)
                 st.success(f"✅ Member '{selected_name}' removed successfully!")
                 st.rerun()
         else:
             st.info("ℹ️ No members to remove.")
         st.markdown('</div>', unsafe_allow_html=True)
+    
+    # 📥 Bulk import: one batched validation, one write, one rerun
+    st.markdown('<div class="leetcode-card">', unsafe_allow_html=True)
+    st.markdown("### 📥 Bulk Import")
+    summary = st.session_state.pop("bulk_summary", None)
+    if summary:
+        if summary["added"]:
+            st.success(f"✅ Added {len(summary['added'])} members.")
+        if summary["invalid"]:
+            st.error("❌ Not found on LeetCode: " + ", ".join(summary["invalid"]))
+        if summary["duplicates"]:
+            st.warning("⚠️ Already on the team or listed twice: " + ", ".join(summary["duplicates"]))
+        if summary["malformed"]:
+            st.warning("⚠️ Could not read these lines: " + "; ".join(summary["malformed"]))
+    bulk_text = st.text_area(
+        "Paste members (one per line)",
+        placeholder="Full Name, leetcode_username",
+        key="bulk_text"
+    )
+    bulk_file = st.file_uploader("…or upload a CSV with name and username columns", type=["csv", "txt"])
+    if st.button("📥 Import Members", key="bulk_import_btn", use_container_width=True):
+        text = bulk_text or ""
+        if bulk_file is not None:
+            text += "\n" + bulk_file.getvalue().decode("utf-8-sig")
+        entries, malformed = parse_members(text)
+        if not entries and not malformed:
+            st.warning("⚠️ Paste at least one member or upload a CSV.")
+        else:
+            with st.spinner(f"🔍 Verifying {len(entries)} LeetCode users..."):
+                summary = onboard_members(user, entries, existing=[m["username"] for m in members])
+            summary["malformed"] = malformed
+            st.session_state.bulk_summary = summary
+            st.rerun()
+    st.markdown('</div>', unsafe_allow_html=True)
 
 # Stop if no members
 if not members:
     st.stop()
 
 # Fetch and process team data
-with st.spinner("🔄 Fetching team data from LeetCode..."):
-    data = fetch_all_data(members)
+with metrics.timed("fetch_team"):
+    data, still_loading = stream_team(members)
     
 if not data:
-    st.error("❌ Failed to fetch data for team members")
+    if still_loading:
+        st.warning("⏳ LeetCode is slow to respond; team data will appear on the next refresh.")
+    else:
+        st.error("❌ Failed to fetch data for team members")
     st.stop()
     
-df = pd.DataFrame(data)
-df_sorted = df.sort_values(by="totalSolved", ascending=False)
+with metrics.timed("snapshots"):
+    weekly_gains = snapshots.solved_since([d["username"] for d in data], time.time() - snapshots.WEEK)
+# Any submission in the last 7 days, from the locally synced calendar
+with metrics.timed("activity"):
+    active = activity.active_since([d["username"] for d in data], time.time() - snapshots.WEEK)
+for item in data:
+    item["solvedThisWeek"] = weekly_gains.get(item["username"], 0)
+    item["activeThisWeek"] = item["username"] in active or item["solvedThisWeek"] > 0
+with metrics.timed("leaderboard"):
+    board = build_leaderboard(data)
+with metrics.timed("dataframe"):
+    df_sorted = pd.DataFrame(board["rows"])
 
 # Layout: Leaderboard (left) | Profile (right)
 left_col, right_col = st.columns([1, 2])
 
 with left_col:
     st.markdown("### 🏆 Leaderboard")
+    stale_count = sum(1 for row in board["rows"] if row.get("stale"))
+    if stale_count or still_loading:
+        st.caption(
+            f"⏳ {stale_count + len(still_loading)} member(s) could not be refreshed: "
+            f"{stale_count} shown with older stats, {len(still_loading)} not shown. "
+            "They update on the next refresh."
+        )
     st.markdown('<div class="leetcode-card">', unsafe_allow_html=True)
     
-    selected_user = st.session_state.get("selected_user", df_sorted.iloc[0]["username"])
+    selected_user = st.session_state.get("selected_user", board["rows"][0]["username"])
+    
+    # Search / filter / paging: only the current page is rendered
+    search_col, filter_col = st.columns([2, 1])
+    query = search_col.text_input("Search members", key="lb_query", placeholder="🔍 Name or username",
+                                  label_visibility="collapsed", on_change=reset_leaderboard_page)
+    active_only = filter_col.checkbox("Active in last 7 days", key="lb_active_only", on_change=reset_leaderboard_page)
+    matches = filter_rows(board["rows"], query, active_only)
+    page_size = st.session_state.get("lb_page_size", DEFAULT_PAGE_SIZE)
+    page_rows, page, page_count = paginate(matches, st.session_state.get("lb_page", 1), page_size)
+    st.session_state.lb_page = page
+    
+    if not matches:
+        st.info("ℹ️ No members match your search.")
     
-    for i, row in enumerate(df_sorted.itertuples(), start=1):
-        is_selected = (row.username == selected_user)
+    avatars = avatar_data_uris([row["avatar"] for row in page_rows], 40)
+    for row in page_rows:
+        is_selected = (row["username"] == selected_user)
         item_class = "leaderboard-item selected" if is_selected else "leaderboard-item"
         
         st.markdown(f'<div class="{item_class}">', unsafe_allow_html=True)
         col1, col2 = st.columns([0.2, 0.8])
         with col1:
-            st.image(row.avatar, width=40)
+            # Cached thumbnail once downloaded; until then the CDN URL, which
+            # the browser loads lazily
+            st.markdown(
+                f'<img src="{avatars.get(row["avatar"], row["avatar"])}" width="40" height="40" loading="lazy" style="border-radius:50%;">',
+                unsafe_allow_html=True
+            )
         with col2:
             if st.button(
-                f"#{i} {row.name}",
-                key=f"lb_{row.username}",
+                f"#{row['rank']} {row['name']}",
+                key=f"lb_{row['username']}",
                 use_container_width=True
             ):
-                st.session_state.selected_user = row.username
+                st.session_state.selected_user = row["username"]
                 st.rerun()
             
             # Progress bar for problems solved
-            max_problems = max(df['totalSolved'])
-            progress = row.totalSolved / max_problems if max_problems > 0 else 0
-            st.progress(progress, text=f"🎯 {row.totalSolved} Submissions")
+            week_text = f" • 🔥 +{row['solvedThisWeek']} this week" if row["solvedThisWeek"] > 0 else ""
+            stale_text = " • ⏳ stale" if row.get("stale") else ""
+            st.progress(row["progress"], text=f"🎯 {row['totalSolved']} Submissions{week_text}{stale_text}")
             
         st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    if page_count > 1 or len(board["rows"]) > LEADERBOARD_PAGE_SIZES[0]:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        if prev_col.button("◀", key="lb_prev", disabled=page <= 1, use_container_width=True):
+            st.session_state.lb_page = page - 1
+            st.rerun()
+        info_col.markdown(
+            f'<div style="text-align:center; color: var(--text-secondary);">'
+            f'Page {page} of {page_count} • {len(matches)} members</div>',
+            unsafe_allow_html=True
+        )
+        if next_col.button("▶", key="lb_next", disabled=page >= page_count, use_container_width=True):
+            st.session_state.lb_page = page + 1
+            st.rerun()
+        st.selectbox(
+            "Rows per page",
+            LEADERBOARD_PAGE_SIZES,
+            index=LEADERBOARD_PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+            key="lb_page_size",
+            on_change=reset_leaderboard_page
+        )
+
+    # Solved this week
+    if board["weekly"]:
+        st.markdown("### 🔥 This Week")
+        for i, row in enumerate(board["weekly"][:5], start=1):
+            st.markdown(f"**#{i} {row['name']}** — +{row['solvedThisWeek']} solved")
 
 # Selected user logic
-selected_data = next((item for item in data if item["username"] == selected_user), None)
+selected_data = board["index"].get(selected_user)
 
 with right_col:
     if selected_data:
@@ -509,7 +517,7 @@ with right_col:
         st.markdown(f"""
             <div class="profile-header">
                 <div style="display:flex; align-items:center; gap: 20px;">
-                    <img src="{selected_data['avatar']}" width="80" style="border-radius:50%; border: 3px solid var(--leetcode-orange);">
+                    <img src="{avatar_data_uri(selected_data['avatar'], 80)}" width="80" style="border-radius:50%; border: 3px solid var(--leetcode-orange);">
                     <div>
                         <h2 style="margin:0; color: var(--text-primary);">{selected_data['name']}</h2>
                         <div style="display:flex; gap:10px; margin-top:8px; flex-wrap: wrap;">
@@ -521,16 +529,9 @@ with right_col:
             </div>
         """, unsafe_allow_html=True)
         
-        # Get difficulty counts
-        def get_difficulty_count(difficulty):
-            for d in selected_data["submissions"]:
-                if d["difficulty"] == difficulty:
-                    return d.get("count", 0)
-            return 0
-        
-        easy_count = get_difficulty_count("Easy")
-        medium_count = get_difficulty_count("Medium")
-        hard_count = get_difficulty_count("Hard")
+        easy_count = selected_data["easy"]
+        medium_count = selected_data["medium"]
+        hard_count = selected_data["hard"]
         
         # Stats Cards - Only 4 cards: Total, Easy, Medium, Hard
         st.markdown("### 📊 Problems Solved")
@@ -570,102 +571,66 @@ with right_col:
         # Difficulty Distribution
         st.markdown("### 🎯 Difficulty Distribution")
         if selected_data['totalSolved'] > 0:
-            # Create data for pie chart
-            diff_data = [
-                {'difficulty': 'Easy', 'count': easy_count},
-                {'difficulty': 'Medium', 'count': medium_count},
-                {'difficulty': 'Hard', 'count': hard_count}
-            ]
-            
-            # Filter out zero counts
-            diff_data = [d for d in diff_data if d['count'] > 0]
-            
-            if diff_data:
-                # Create pie chart with LeetCode colors
-                fig = px.pie(
-                    diff_data,
-                    values='count',
-                    names='difficulty',
-                    color='difficulty',
-                    color_discrete_map={
-                        'Easy': '#34A853',
-                        'Medium': '#FFA116',
-                        'Hard': '#EF4743'
-                    },
-                    hole=0.4,
-                )
-                
-                fig.update_layout(
-                    showlegend=True,
-                    margin=dict(l=20, r=20, t=30, b=0),
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=-0.2,
-                        xanchor="center",
-                        x=0.5,
-                        font=dict(size=12)
-                    ),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    font=dict(size=12)
-                )
-                
-                fig.update_traces(
-                    textposition='inside',
-                    textinfo='percent+label',
-                    hovertemplate="<b>%{label}</b><br>Solved: %{value}<br>Percentage: %{percent}",
-                    textfont=dict(color='#FFFFFF', size=11)
-                )
-                
+            fig = charts.difficulty_pie(easy_count, medium_count, hard_count)
+            if fig is not None:
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("📊 No difficulty distribution data available.")
         else:
             st.info("🎯 No problems solved yet!")
+        
+        # Activity from locally synced calendar, submissions and contests
+        st.markdown("### 📅 Activity")
+        today = int(time.time()) // snapshots.DAY * snapshots.DAY
+        with metrics.timed("activity"):
+            days = activity.calendar([selected_user], today - 26 * 7 * snapshots.DAY)
+            recent = activity.recent_submissions(selected_user, 5)
+            contests = activity.contest_summary(selected_user)
+        if days or recent:
+            streak_col, active_col, rating_col = st.columns(3)
+            streak_col.metric("🔥 Streak", f"{activity.streak(selected_user, today)} days")
+            active_col.metric("📆 Active days (26 weeks)", sum(1 for count in days.values() if count > 0))
+            rating_col.metric("🏁 Contest rating", f"{contests[0]:.0f}" if contests and contests[0] else "—",
+                              help=f"{contests[1]} contests attended" if contests else None)
+            st.plotly_chart(charts.activity_heatmap(days, today), use_container_width=True)
+            for title, slug, timestamp in recent:
+                st.markdown(
+                    f"✅ [{title}](https://leetcode.com/problems/{slug}/) • "
+                    f"{time.strftime('%b %d, %H:%M', time.gmtime(timestamp))} UTC"
+                )
+        else:
+            st.info("📅 Activity will appear after the next background sync.")
 
 # Bottom Section
 st.divider()
 st.markdown("### 📈 Team Performance")
 st.markdown('<div class="leetcode-card">', unsafe_allow_html=True)
 
-# Create bar chart with LeetCode colors
-fig = px.bar(
-    df_sorted,
-    x='name',
-    y='totalSolved',
-    color='totalSolved',
-    color_continuous_scale=[(0, "#FFA116"), (1, "#34A853")],
-    text='totalSolved',
-    labels={'name': 'Team Members', 'totalSolved': 'Problems Solved'},
-    title="Team Members Performance Comparison"
-)
-
-fig.update_layout(
-    xaxis_title="Team Members",
-    yaxis_title="Problems Solved",
-    plot_bgcolor='rgba(0,0,0,0)',
-    paper_bgcolor='rgba(0,0,0,0)',
-    margin=dict(l=20, r=20, t=50, b=20),
-    xaxis=dict(tickangle=-45),
-    showlegend=False,
-    height=400,
-    title=dict(
-        font=dict(size=16),
-        x=0.5,
-        xanchor='center'
-    )
-)
+bar_col, progress_col = st.columns(2)
 
-fig.update_traces(
-    texttemplate='%{text}',
-    textposition='outside',
-    marker_line_color='rgba(0,0,0,0.1)',
-    marker_line_width=1,
-    textfont=dict(size=12, color='#FFFFFF')
-)
+team_size = len(board["rows"])
+show_all = False
+if team_size > charts.TEAM_BAR_TOP_N:
+    show_all = bar_col.checkbox(f"Show all {team_size} members", key="bar_show_all")
+    if not show_all:
+        bar_col.caption(f"Top {charts.TEAM_BAR_TOP_N} of {team_size} members")
+fig = charts.team_bar(board["rows"], top_n=None if show_all else charts.TEAM_BAR_TOP_N)
+bar_col.plotly_chart(fig, use_container_width=True)
 
-st.plotly_chart(fig, use_container_width=True)
+# Progress over time from stored snapshots (one point per member per day)
+with progress_col:
+    names = dict(zip(df_sorted["username"], df_sorted["name"]))
+    with metrics.timed("snapshots"):
+        points = snapshots.history(df_sorted["username"], time.time() - 30 * snapshots.DAY)
+    if points:
+        with metrics.timed("dataframe"):
+            history_df = pd.DataFrame(points, columns=["username", "taken_at", "totalSolved", "easy", "medium", "hard"])
+            history_df["name"] = history_df["username"].map(names)
+            history_df["date"] = pd.to_datetime(history_df["taken_at"], unit="s")
+        progress_fig = charts.progress_line(history_df)
+        st.plotly_chart(progress_fig, use_container_width=True)
+    else:
+        st.info("📈 Progress history will appear after the next refresh.")
 st.markdown('</div>', unsafe_allow_html=True)
 
 # Footer
@@ -675,4 +640,6 @@ st.markdown(
     '🚀 Built with Streamlit • 💻 Devoloped By Laya• 📊 Team Dashboard'
     '</div>',
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+performance_panel(user)
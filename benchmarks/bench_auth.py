@@ -0,0 +1,55 @@
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import auth
+
+# Login cost per KDF setting: one password verification alone and under a
+# burst of concurrent logins, against a latency budget. The suggested
+# DASHBOARD_KDF_COST is the highest cost whose p95 under load fits the budget.
+# Run from the repository root: python -m benchmarks.bench_auth
+
+def verify_times(stored, count, concurrency):
+    def one(_):
+        start = time.perf_counter()
+        auth.verify_password("correct horse battery staple", stored)
+        return (time.perf_counter() - start) * 1000
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return sorted(pool.map(one, range(count)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hashing cost benchmark")
+    parser.add_argument("--costs", type=int, nargs="+", default=[2 ** 12, 2 ** 13, 2 ** 14, 2 ** 15, 2 ** 16],
+                        help="scrypt n values (PBKDF2 iterations where scrypt is unavailable)")
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous logins")
+    parser.add_argument("--logins", type=int, default=32, help="logins per cost under load")
+    parser.add_argument("--budget", type=float, default=250.0, help="p95 login latency budget in ms")
+    args = parser.parse_args()
+
+    print(f"{'cost':>8} {'single (ms)':>12} {'p50 (ms)':>9} {'p95 (ms)':>9} {'MiB/login':>10}")
+    suggested = None
+    for cost in args.costs:
+        stored = auth.hash_password("correct horse battery staple", cost=cost)
+        single = statistics.median(verify_times(stored, 3, 1))
+        times = verify_times(stored, args.logins, args.concurrency)
+        p95 = times[max(0, int(len(times) * 0.95) - 1)]
+        memory = 128 * cost * auth.SCRYPT_R * auth.SCRYPT_P / 2 ** 20 if stored.startswith("scrypt") else 0
+        print(f"{cost:>8} {single:>12.1f} {statistics.median(times):>9.1f} {p95:>9.1f} {memory:>10.0f}")
+        if p95 <= args.budget:
+            suggested = cost
+    print(f"{args.concurrency} concurrent logins, budget {args.budget:.0f} ms p95 "
+          f"(current DASHBOARD_KDF_COST {auth.KDF_COST})")
+    if suggested is None:
+        print("no cost fits the budget")
+    else:
+        print(f"suggested DASHBOARD_KDF_COST={suggested}")
+
+    token = auth.issue_token("bench")
+    start = time.perf_counter()
+    for _ in range(10_000):
+        auth.verify_token(token)
+    print(f"session token check: {(time.perf_counter() - start) * 100:.1f} us per rerun")
+
+if __name__ == "__main__":
+    main()
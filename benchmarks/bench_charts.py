@@ -0,0 +1,35 @@
+import argparse
+import time
+
+from benchmarks.bench_leaderboard import synthetic_team
+from utils import charts, leaderboard
+
+# Team bar chart cost per rerun: a cold build, a cached rerun, and the
+# serialized figure size with all members versus the top-N default.
+# Run from the repository root: python -m benchmarks.bench_charts
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Figure construction benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--top-n", type=int, default=charts.TEAM_BAR_TOP_N)
+    args = parser.parse_args()
+
+    # Keep plotly's first-use import cost out of the first row
+    charts.team_bar(leaderboard.compute_leaderboard(synthetic_team(1))["rows"])
+    print(f"{'members':>8} {'bars':>6} {'cold (ms)':>10} {'cached (ms)':>12} {'figure KiB':>11}")
+    for size in args.sizes:
+        rows = leaderboard.compute_leaderboard(synthetic_team(size))["rows"]
+        for top_n in (None, args.top_n):
+            charts.clear_cache()
+            fig, t_cold = timed(lambda: charts.team_bar(rows, top_n=top_n))
+            _fig, t_cached = timed(lambda: charts.team_bar(rows, top_n=top_n))
+            bars = size if top_n is None else min(size, top_n)
+            print(f"{size:>8} {bars:>6} {t_cold:>10.1f} {t_cached:>12.2f} {len(fig.to_json()) / 1024:>11.1f}")
+
+if __name__ == "__main__":
+    main()
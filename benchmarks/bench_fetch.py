@@ -0,0 +1,48 @@
+import argparse
+import time
+
+from benchmarks.stub_server import StubServer
+from utils import leetcodeapi
+
+# Wall-clock comparison of the serial loop, the concurrent fetch engine and
+# aliased batch queries.
+# Run from the repository root: python -m benchmarks.bench_fetch
+
+def serial(usernames):
+    return [leetcodeapi.fetch_user_data(u) for u in usernames]
+
+def concurrent(usernames, workers):
+    results, _errors = leetcodeapi.fetch_users_concurrently(usernames, max_workers=workers)
+    return results
+
+def batched(usernames, workers):
+    return leetcodeapi.fetch_users_data(usernames, max_workers=workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch engine benchmark")
+    parser.add_argument("--latency", type=float, default=0.1, help="stub latency per request (s)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25, 50])
+    parser.add_argument("--workers", type=int, default=leetcodeapi.MAX_WORKERS)
+    args = parser.parse_args()
+    # Measure the client itself, not the production rate budget
+    leetcodeapi.rate_limiter.set_rate(None, 1)
+
+    with StubServer(latency=args.latency) as server:
+        leetcodeapi.API_URL = server.url
+        print(f"{'members':>8} {'serial (s)':>12} {'concurrent (s)':>15} {'batched (s)':>12} {'requests':>9}")
+        for size in args.sizes:
+            usernames = [f"user{i}" for i in range(size)]
+            start = time.perf_counter()
+            serial(usernames)
+            t_serial = time.perf_counter() - start
+            start = time.perf_counter()
+            concurrent(usernames, args.workers)
+            t_conc = time.perf_counter() - start
+            before = server.requests
+            start = time.perf_counter()
+            batched(usernames, args.workers)
+            t_batch = time.perf_counter() - start
+            print(f"{size:>8} {t_serial:>12.3f} {t_conc:>15.3f} {t_batch:>12.3f} {server.requests - before:>9}")
+
+if __name__ == "__main__":
+    main()
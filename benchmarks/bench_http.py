@@ -0,0 +1,52 @@
+import argparse
+import time
+
+from benchmarks.stub_server import StubServer
+from utils import leetcodeapi
+
+# Exercises the pooled client against a stub that injects slow responses,
+# connection resets and 429s, then reports retry and connection reuse stats.
+# Run from the repository root: python -m benchmarks.bench_http
+
+def run(name, server_options, usernames, workers):
+    with StubServer(**server_options) as server:
+        leetcodeapi.API_URL = server.url
+        leetcodeapi.reset_session()
+        before = leetcodeapi.http_stats()
+        start = time.perf_counter()
+        results, errors = leetcodeapi.fetch_users_concurrently(usernames, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        after = leetcodeapi.http_stats()
+    delta = {k: after[k] - before[k] for k in before if isinstance(before[k], int)}
+    ok = sum(r is not None for r in results)
+    reuse = after["connection_reuse"]
+    print(f"{name:<10} {elapsed:>8.2f}s  ok={ok}/{len(usernames)}  failed={len(errors)}  "
+          f"requests={delta['requests']}  retries={delta['retries']}  "
+          f"429={delta['throttled']}  5xx={delta['server_errors']}  "
+          f"timeouts={delta['timeouts']}  resets={delta['connection_errors']}  "
+          f"server_connections={server.connections}  "
+          f"reuse={'n/a' if reuse is None else f'{reuse:.0%}'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP client resilience benchmark")
+    parser.add_argument("--members", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=leetcodeapi.MAX_WORKERS)
+    args = parser.parse_args()
+    # Measure the client itself, not the production rate budget
+    leetcodeapi.rate_limiter.set_rate(None, 1)
+
+    usernames = [f"user{i}" for i in range(args.members)]
+    leetcodeapi.BACKOFF_BASE = 0.05
+    leetcodeapi.READ_TIMEOUT = 0.5
+    scenarios = [
+        ("clean", {"latency": 0.01}),
+        ("throttled", {"latency": 0.01, "throttle_rate": 0.2, "retry_after": 0}),
+        ("5xx", {"latency": 0.01, "error_rate": 0.2}),
+        ("resets", {"latency": 0.01, "reset_rate": 0.1}),
+        ("slow", {"latency": 0.01, "slow_rate": 0.1, "slow_latency": 1.0}),
+    ]
+    for name, options in scenarios:
+        run(name, options, usernames, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from utils import leaderboard
+
+# Ranking cost for large synthetic teams: the original inline pandas code
+# versus utils.leaderboard.
+# Run from the repository root: python -m benchmarks.bench_leaderboard
+
+def synthetic_team(size, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "username": f"user{i}",
+            "name": f"Member {i}",
+            "avatar": f"https://assets.leetcode.com/users/user{i}/avatar.png",
+            "totalSolved": rng.randint(0, 3000),
+            "solvedThisWeek": rng.randint(0, 20),
+        }
+        for i in range(size)
+    ]
+
+def inline_pandas(data, selected):
+    # What app.py did before: sort a DataFrame, recompute the max per row
+    # and scan the list for the selected member.
+    df = pd.DataFrame(data)
+    df_sorted = df.sort_values(by="totalSolved", ascending=False)
+    progress = []
+    for row in df_sorted.itertuples():
+        max_problems = max(df["totalSolved"])
+        progress.append(row.totalSolved / max_problems if max_problems > 0 else 0)
+    return next((item for item in data if item["username"] == selected), None)
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard computation benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'members':>8} {'inline (ms)':>12} {'compute (ms)':>13}")
+    for size in args.sizes:
+        data = synthetic_team(size)
+        selected = data[-1]["username"]
+        t_inline = timed(lambda: inline_pandas(data, selected), args.repeat)
+        t_compute = timed(lambda: leaderboard.compute_leaderboard(data)["index"].get(selected), args.repeat)
+        print(f"{size:>8} {t_inline:>12.2f} {t_compute:>13.2f}")
+
+if __name__ == "__main__":
+    main()
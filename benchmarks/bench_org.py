@@ -0,0 +1,67 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from utils import org
+from utils.profile import MemberProfile
+
+# Organisation rollups over synthetic teams.
+# Run from the repository root: python -m benchmarks.bench_org
+
+def synthetic_org(teams, team_size, seed=0):
+    rng = random.Random(seed)
+    frames = []
+    for t in range(teams):
+        members = [{"name": f"Member {t}-{i}", "username": f"user_{t}_{i}"} for i in range(team_size)]
+        profiles = {}
+        for m in members:
+            easy, medium, hard = rng.randint(0, 800), rng.randint(0, 1500), rng.randint(0, 600)
+            profiles[m["username"]] = MemberProfile(
+                m["username"], ranking=rng.randint(1, 5_000_000),
+                all_solved=easy + medium + hard, easy=easy, medium=medium, hard=hard,
+            )
+        frames.append((f"Team{t}", members, profiles))
+    return frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Organisation rollup benchmark")
+    parser.add_argument("--teams", type=int, default=300)
+    parser.add_argument("--team-size", type=int, default=70)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    teams = synthetic_org(args.teams, args.team_size)
+    start = time.perf_counter()
+    frames = [org.team_frame(team, members, profiles) for team, members, profiles in teams]
+    t_frames = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = pd.concat(frames, ignore_index=True)
+    frame["team"] = frame["team"].astype("category")
+    t_concat = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        stats, members = org.org_rollups(frame)
+    t_rollup = (time.perf_counter() - start) / args.repeat
+
+    # One team changed: rebuild its frame, concat, roll up again
+    team, members_list, profiles = teams[0]
+    start = time.perf_counter()
+    frames[0] = org.team_frame(team, members_list, profiles)
+    frame = pd.concat(frames, ignore_index=True)
+    frame["team"] = frame["team"].astype("category")
+    org.org_rollups(frame)
+    t_incremental = time.perf_counter() - start
+
+    print(f"{args.teams} teams x {args.team_size} members = {len(frame)} rows")
+    print(f"  build all team frames: {t_frames * 1000:8.1f} ms")
+    print(f"  concat:                {t_concat * 1000:8.1f} ms")
+    print(f"  rollups:               {t_rollup * 1000:8.1f} ms")
+    print(f"  one team changed:      {t_incremental * 1000:8.1f} ms")
+    print(stats.head(3).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.stub_server import make_problem
+from utils import db, problems
+
+# Problem index build and query cost for a synthetic team: every member has
+# solved a random share of the catalogue.
+# Run from the repository root: python -m benchmarks.bench_problems
+
+def populate(members, problem_count, solved_share, seed=0):
+    rng = random.Random(seed)
+    usernames = [f"user{i}" for i in range(members)]
+    catalog = [make_problem(n) for n in range(1, problem_count + 1)]
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO problems (title_slug, frontend_id, title, difficulty, topics) VALUES (?, ?, ?, ?, ?)",
+            [(p["titleSlug"], p["frontendQuestionId"], p["title"], p["difficulty"],
+              ",".join(t["name"] for t in p["topicTags"])) for p in catalog],
+        )
+        for username in usernames:
+            solved = rng.sample(catalog, int(problem_count * rng.uniform(0, 2 * solved_share)))
+            conn.executemany(
+                "INSERT INTO ac_submissions (username, submission_id, title_slug, title, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(username, f"{username}-{i}", p["titleSlug"], p["title"], 1_700_000_000 + i)
+                 for i, p in enumerate(solved)],
+            )
+            conn.execute(
+                "INSERT INTO activity_sync (username, synced_at) VALUES (?, ?)", (username, time.time())
+            )
+    return usernames
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Problem index benchmark")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--problems", type=int, default=3000)
+    parser.add_argument("--solved-share", type=float, default=0.1, help="average share of problems solved")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    db.DB_PATH = os.path.join(tmp, "bench.db")
+    try:
+        start = time.perf_counter()
+        usernames = populate(args.members, args.problems, args.solved_share)
+        print(f"populated {args.members} members x {args.problems} problems in {time.perf_counter() - start:.1f}s")
+
+        index, t_compute = timed(lambda: problems.compute_index(usernames), 1)
+        problems.build_index(usernames)
+        _, t_cached = timed(lambda: problems.build_index(usernames), args.repeat)
+        with db.transaction() as conn:
+            conn.execute("UPDATE activity_sync SET synced_at = ? WHERE username = ?", (time.time(), usernames[0]))
+        _, t_one = timed(lambda: problems.build_index(usernames), 1)
+        print(f"{'compute_index':<22} {t_compute:>9.1f} ms  "
+              f"({index['solved'].nbytes / 1024:.0f} KiB of bits)")
+        print(f"{'build_index (cached)':<22} {t_cached:>9.2f} ms")
+        print(f"{'rebuild, 1 synced':<22} {t_one:>9.1f} ms")
+        topic = next(iter(index["topics"]))
+        queries = [
+            ("coverage", lambda: problems.coverage(index)),
+            ("coverage_by_topic", lambda: problems.coverage_by_topic(index)),
+            ("solver_counts", lambda: problems.solver_counts(index)),
+            ("overlap", lambda: problems.overlap(index, usernames[0], usernames[1])),
+            ("gaps", lambda: problems.gaps(index)),
+            ("gaps (topic)", lambda: problems.gaps(index, topic=topic)),
+            ("recommend", lambda: problems.recommend(index, usernames[0], topic=topic)),
+        ]
+        for name, query in queries:
+            _, elapsed = timed(query, args.repeat)
+            print(f"{name:<22} {elapsed:>9.2f} ms")
+    finally:
+        db.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import pandas as pd
+
+from utils.profile import MemberProfile, decode, profiles_frame
+
+# Profile representation cost for a large team: the JSON-shaped dicts the
+# cache used to hold versus MemberProfile, for resident memory, cached size,
+# encode/decode time and DataFrame construction.
+# Run from the repository root: python -m benchmarks.bench_profiles
+
+def payload(i, rng):
+    counts = [("Easy", rng.randint(0, 800)), ("Medium", rng.randint(0, 1500)), ("Hard", rng.randint(0, 600))]
+    counts.insert(0, ("All", sum(c for _d, c in counts)))
+    return {
+        "username": f"user{i}",
+        "profile": {
+            "realName": f"Member {i}",
+            "userAvatar": f"https://assets.leetcode.com/users/user{i}/avatar_{i}.png",
+            "ranking": rng.randint(1, 5_000_000),
+        },
+        "submitStatsGlobal": {
+            "acSubmissionNum": [{"difficulty": d, "count": c, "submissions": c * 2} for d, c in counts]
+        },
+    }
+
+def resident(build):
+    # (object, KiB retained by it)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, (after - before) / 1024
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile representation benchmark")
+    parser.add_argument("--members", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    payloads = [payload(i, rng) for i in range(args.members)]
+    # Built from JSON text, as read_cache did, so strings are not shared with the payloads
+    dicts, dict_kib = resident(
+        lambda: [json.loads(json.dumps(MemberProfile.from_payload(p).to_dict())) for p in payloads]
+    )
+    profiles, profile_kib = resident(lambda: [MemberProfile.unpack(MemberProfile.from_payload(p).pack()) for p in payloads])
+
+    json_rows, t_json_encode = timed(lambda: [json.dumps(d) for d in dicts])
+    packed_rows, t_pack = timed(lambda: [p.pack() for p in profiles])
+    _, t_json_decode = timed(lambda: [json.loads(r) for r in json_rows])
+    decoded, t_unpack = timed(lambda: [decode(r) for r in packed_rows])
+    assert decoded == profiles
+    _, t_legacy = timed(lambda: [decode(r) for r in json_rows])
+
+    names = {p.username: p.real_name for p in profiles}
+    _, t_frame_dicts = timed(lambda: pd.DataFrame([dict(d, name=names[d["username"]]) for d in dicts]))
+    _, t_frame = timed(lambda: profiles_frame(profiles, names))
+
+    print(f"{args.members} members")
+    print(f"{'':<22} {'dict (JSON)':>12} {'MemberProfile':>14}")
+    print(f"{'resident KiB':<22} {dict_kib:>12.0f} {profile_kib:>14.0f}")
+    print(f"{'cached KiB':<22} {sum(map(len, json_rows)) / 1024:>12.0f} {sum(map(len, packed_rows)) / 1024:>14.0f}")
+    print(f"{'encode ms':<22} {t_json_encode:>12.1f} {t_pack:>14.1f}")
+    print(f"{'decode ms':<22} {t_json_decode:>12.1f} {t_unpack:>14.1f}")
+    print(f"{'DataFrame ms':<22} {t_frame_dicts:>12.1f} {t_frame:>14.1f}")
+    print(f"legacy JSON rows -> MemberProfile: {t_legacy:.1f} ms")
+
+if __name__ == "__main__":
+    main()
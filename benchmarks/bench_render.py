@@ -0,0 +1,80 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from streamlit import logger as st_logger
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_leaderboard import synthetic_team
+from benchmarks.stub_server import StubServer, keep_app_offline
+from utils import cache, db, storage
+from utils.auth import start_session
+from utils.profile import MemberProfile
+
+# Dashboard render time for synthetic teams, with every member rendered on
+# one page versus the paginated leaderboard. Data comes from stubs and the
+# app is kept off the network (keep_app_offline), so the numbers measure
+# script execution and element count only.
+# Run from the repository root: python -m benchmarks.bench_render
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+def install_team(size):
+    team = synthetic_team(size)
+    members = [{"name": m["name"], "username": m["username"]} for m in team]
+    profiles = {
+        m["username"]: MemberProfile(
+            m["username"], m["name"], m["avatar"], 1000 + i,
+            easy=m["totalSolved"] // 2, medium=m["totalSolved"] // 3, hard=m["totalSolved"] // 6,
+            easy_submissions=m["totalSolved"], medium_submissions=m["totalSolved"],
+            hard_submissions=m["totalSolved"],
+        )
+        for i, m in enumerate(team)
+    }
+    storage.load_members = lambda user: members
+    cache.iter_users_data = lambda usernames, ttl=None, stale_ttl=None, team=None, timeout=None: (
+        (u, profiles.get(u), "fresh") for u in usernames
+    )
+
+def render(page_size, repeat):
+    timings = []
+    elements = 0
+    for _ in range(repeat):
+        at = AppTest.from_file(APP_PATH, default_timeout=600)
+        start_session(at.session_state, "bench")
+        at.session_state.lb_page_size = page_size
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        elements = len(at.button) + len(at.markdown)
+    return min(timings) * 1000, elements
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard render benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    st_logger.set_log_level("error")
+
+    tmp = tempfile.mkdtemp()
+    db.DB_PATH = os.path.join(tmp, "bench.db")
+    try:
+        with StubServer() as server:
+            keep_app_offline(server.url)
+            print(f"{'members':>8} {'all rows (ms)':>14} {'elements':>9} {'paged (ms)':>11} {'elements':>9}")
+            for size in args.sizes:
+                install_team(size)
+                t_all, n_all = render(size, args.repeat)
+                t_paged, n_paged = render(args.page_size, args.repeat)
+                print(f"{size:>8} {t_all:>14.0f} {n_all:>9} {t_paged:>11.0f} {n_paged:>9}")
+    finally:
+        db.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Cold-start cost of the login page and of the first dashboard render. Each
+# sample runs in a fresh interpreter so module imports are really cold;
+# --eager additionally imports pandas and plotly up front, which is what
+# every page paid when app.py imported them at the top. The app is kept off
+# the network (stub_server.keep_app_offline).
+# Run from the repository root: python -m benchmarks.bench_startup
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+HEAVY_MODULES = ("pandas", "numpy", "plotly.express")
+
+def child(page, eager, size):
+    from streamlit import logger as st_logger
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.stub_server import StubServer, keep_app_offline
+    from utils import db
+
+    st_logger.set_log_level("error")
+    tmp = tempfile.mkdtemp()
+    db.DB_PATH = os.path.join(tmp, "bench.db")
+    try:
+        with StubServer() as server:
+            at = AppTest.from_file(APP_PATH, default_timeout=600)
+            if page == "dashboard":
+                from utils.auth import start_session
+                start_session(at.session_state, "bench")
+            start = time.perf_counter()
+            if eager:
+                import pandas
+                import plotly.express
+            # Inside the timer: it imports the app modules it stubs, as the
+            # app would. The login page never loads avatars.
+            keep_app_offline(server.url, stub_avatars=page == "dashboard")
+            if page == "dashboard":
+                # The synthetic team helpers import pandas themselves
+                from benchmarks.bench_render import install_team
+                install_team(size)
+            at.run()
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(at.exception[0].value)
+    finally:
+        db.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+    print(json.dumps({"ms": elapsed * 1000, "loaded": loaded}))
+
+def sample(page, eager, size):
+    command = [sys.executable, "-m", "benchmarks.bench_startup", "--child", page, "--size", str(size)]
+    if eager:
+        command.append("--eager")
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="App cold-start benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--size", type=int, default=20, help="team size for the dashboard render")
+    parser.add_argument("--child", choices=["login", "dashboard"], help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.eager, args.size)
+        return
+
+    print(f"{'page':<10} {'eager (ms)':>11} {'lazy (ms)':>10}  heavy modules loaded (lazy)")
+    for page in ("login", "dashboard"):
+        eager = [sample(page, True, args.size)["ms"] for _ in range(args.repeat)]
+        lazy_samples = [sample(page, False, args.size) for _ in range(args.repeat)]
+        lazy = [s["ms"] for s in lazy_samples]
+        loaded = ", ".join(lazy_samples[-1]["loaded"]) or "none"
+        print(f"{page:<10} {statistics.median(eager):>11.0f} {statistics.median(lazy):>10.0f}  {loaded}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from utils import storage
+
+# Many processes adding members to the JSON backend at once. Every add must
+# survive and the file must stay valid JSON throughout.
+# Run from the repository root: python -m benchmarks.stress_json_store
+
+def add_members(path, worker, count):
+    storage.STORAGE_BACKEND = "json"
+    storage.DATA_PATH = path
+    for i in range(count):
+        team = "Shared" if i % 2 == 0 else f"Team{worker % 4}"
+        assert storage.add_member(team, f"Member {worker}-{i}", f"user_{worker}_{i}")
+        # Readers in other processes must never see a torn file
+        with open(path) as f:
+            json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON store concurrency stress test")
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--members", type=int, default=50, help="members added per process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "members.json")
+        with open(path, "w") as f:
+            json.dump({}, f)
+        start = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=add_members, args=(path, w, args.members))
+            for w in range(args.processes)
+        ]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        with open(path) as f:
+            all_members = json.load(f)
+        stored = sum(len(members) for members in all_members.values())
+        expected = args.processes * args.members
+        failed = sum(p.exitcode != 0 for p in workers)
+        print(f"{args.processes} processes x {args.members} adds in {elapsed:.2f}s: "
+              f"{stored}/{expected} members stored, {failed} workers failed")
+        leftovers = [n for n in os.listdir(tmp) if n.endswith(".tmp")]
+        if stored != expected or failed or leftovers:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
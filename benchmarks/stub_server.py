@@ -0,0 +1,246 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for leetcode.com/graphql used by the benchmarks.
+
+def make_user(username):
+    # Deterministic, realistic-looking matchedUser payload
+    seed = sum(ord(c) for c in username)
+    easy, medium, hard = 50 + seed % 200, 30 + seed % 150, seed % 60
+    counts = [("All", easy + medium + hard), ("Easy", easy), ("Medium", medium), ("Hard", hard)]
+    return {
+        "username": username,
+        "profile": {
+            "realName": username.title(),
+            "userAvatar": f"https://assets.leetcode.com/users/{username}/avatar.png",
+            "ranking": 10000 + seed * 37,
+        },
+        "submitStatsGlobal": {
+            "acSubmissionNum": [
+                {"difficulty": d, "count": c, "submissions": c * 2} for d, c in counts
+            ]
+        },
+    }
+
+def lookup(username):
+    # Usernames starting with "missing" behave like renamed or deleted accounts
+    if not username or username.startswith("missing"):
+        return None
+    return make_user(username)
+
+DAY = 24 * 60 * 60
+PROBLEM_COUNT = 3000
+# alias: field(username: $var ...) inside an aliased batch query
+ALIAS_PATTERN = re.compile(r"(\w+): (\w+)\(username: \$(\w+)")
+
+def _seed(username):
+    return sum(ord(c) for c in username)
+
+def make_calendar(username):
+    # Last year of daily submission counts, as LeetCode's JSON-encoded string
+    seed = _seed(username)
+    today = int(time.time()) // DAY * DAY
+    days = {}
+    for k in range(365):
+        count = (seed + k * 7) % 5
+        if count:
+            days[str(today - k * DAY)] = count
+    return json.dumps(days)
+
+def make_recent(username, limit):
+    # Newest first; one accepted submission every few hours up to now
+    seed = _seed(username)
+    step = (seed % 5 + 1) * 3600
+    newest = int(time.time()) // step * step
+    submissions = []
+    for k in range(min(limit, 20)):
+        timestamp = newest - k * step
+        number = (seed * 7 + timestamp // step) % PROBLEM_COUNT + 1
+        submissions.append({
+            "id": f"{seed}{timestamp}",
+            "title": f"Problem {number}",
+            "titleSlug": f"problem-{number}",
+            "timestamp": str(timestamp),
+        })
+    return submissions
+
+def make_contest(username):
+    seed = _seed(username)
+    return {"attendedContestsCount": seed % 8, "rating": 1400 + seed % 600}
+
+def make_contest_history(username):
+    seed = _seed(username)
+    return [
+        {
+            "attended": k < seed % 8,
+            "rating": 1400 + (seed + k * 13) % 600,
+            "ranking": 1 + (seed * (k + 1)) % 20000,
+            "contest": {"title": f"Weekly Contest {300 + k}", "startTime": 1_700_000_000 + k * 7 * DAY},
+        }
+        for k in range(10)
+    ]
+
+TOPICS = ["Array", "String", "Hash Table", "Dynamic Programming", "Math", "Sorting", "Greedy",
+          "Depth-First Search", "Binary Search", "Tree", "Graph", "Two Pointers", "Stack", "Heap"]
+
+def make_problem(number):
+    return {
+        "frontendQuestionId": str(number),
+        "title": f"Problem {number}",
+        "titleSlug": f"problem-{number}",
+        "difficulty": ("Easy", "Medium", "Hard")[number % 3],
+        "topicTags": [{"name": TOPICS[number % len(TOPICS)]}, {"name": TOPICS[(number * 7) % len(TOPICS)]}],
+    }
+
+def make_problem_page(skip, limit):
+    numbers = range(skip + 1, min(skip + limit, PROBLEM_COUNT) + 1)
+    return {"total": PROBLEM_COUNT, "questions": [make_problem(n) for n in numbers]}
+
+def resolve(field, username, variables, query):
+    if not username or username.startswith("missing"):
+        return None
+    if field == "matchedUser":
+        if "userCalendar" in query:
+            return {"userCalendar": {"submissionCalendar": make_calendar(username)}}
+        return make_user(username)
+    if field == "recentAcSubmissionList":
+        return make_recent(username, variables.get("limit", 20))
+    if field == "userContestRanking":
+        return make_contest(username)
+    if field == "userContestRankingHistory":
+        return make_contest_history(username)
+    return None
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.record("connections")
+
+    def send_json(self, status, payload, headers=()):
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.record("requests")
+        fault = self.server.pick_fault()
+        if fault == "reset":
+            # Drop the connection without answering
+            self.close_connection = True
+            return
+        time.sleep(self.server.slow_latency if fault == "slow" else self.server.latency)
+        if fault == "throttle":
+            headers = [("Retry-After", str(self.server.retry_after))] if self.server.retry_after is not None else []
+            self.send_json(429, {"error": "Too many requests"}, headers)
+            return
+        if fault == "error":
+            self.send_json(503, {"error": "Service unavailable"})
+            return
+        variables = body.get("variables", {})
+        if "problemsetQuestionList" in body.get("query", ""):
+            page = make_problem_page(variables.get("skip", 0), variables.get("limit", 100))
+            payload = {"data": {"problemsetQuestionList": page}}
+        elif "username" in variables:
+            payload = {"data": {"matchedUser": lookup(variables["username"])}}
+        else:
+            # Aliased batch query: alias -> field(username: $var)
+            query = body.get("query", "")
+            data = {
+                alias: resolve(field, variables.get(var), variables, query)
+                for alias, field, var in ALIAS_PATTERN.findall(query)
+            }
+            payload = {"data": data}
+            errors = [
+                {"message": "That user does not exist.", "path": [alias]}
+                for alias, user in data.items() if user is None
+            ]
+            if errors:
+                payload["errors"] = errors
+        self.send_json(200, payload)
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # Fault rates are per-request probabilities: "throttle" answers 429 with
+    # Retry-After, "error" answers 503, "reset" closes the socket and "slow"
+    # sleeps slow_latency seconds before answering normally. schedule is an
+    # optional list of faults (None = answer normally) applied to the first
+    # requests in order, before the random rates take over.
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0, throttle_rate=0.0,
+                 error_rate=0.0, reset_rate=0.0, slow_rate=0.0, slow_latency=1.0,
+                 retry_after=0, seed=0, schedule=()):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.faults = [("throttle", throttle_rate), ("error", error_rate),
+                       ("reset", reset_rate), ("slow", slow_rate)]
+        self.slow_latency = slow_latency
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.schedule = list(schedule)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out hang up mid-response; that is expected here
+        pass
+
+    def record(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def pick_fault(self):
+        with self.lock:
+            if self.schedule:
+                return self.schedule.pop(0)
+            roll = self.random.random()
+        for fault, rate in self.faults:
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+def keep_app_offline(api_url, stub_avatars=True):
+    # For benchmarks that run app.py: LeetCode calls go to api_url (a
+    # StubServer), the background refresher is not started and avatars are
+    # served as their original URLs without downloading anything. The app
+    # modules are imported here, not at the top, so cold-start benchmarks
+    # can call this inside their timed region.
+    from utils import leetcodeapi, refresher
+
+    leetcodeapi.API_URL = api_url
+    refresher.start_refresher = lambda *args, **kwargs: None
+    if stub_avatars:
+        from utils import avatars
+
+        avatars.avatar_data_uri = lambda url, size: url
+        avatars.avatar_data_uris = lambda urls, size: {u: u for u in urls if u}
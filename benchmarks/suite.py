@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.bench_leaderboard import synthetic_team
+from benchmarks.stub_server import StubServer
+from utils import cache, db, leaderboard, leetcodeapi, storage
+
+# Reproducible end-to-end suite: every scenario runs against the local stub
+# server and a throwaway database, across several team sizes, and the
+# results (throughput, p50/p95 latency, peak traced memory) are written to a
+# JSON file. Pass --baseline to compare against an earlier results file.
+# Run from the repository root: python -m benchmarks.suite
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+def measure(fn, repeat, items, setup=None):
+    # fn is timed `repeat` times; the peak is traced on one extra run so
+    # tracemalloc overhead stays out of the latency numbers
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    p50 = statistics.median(timings)
+    return {
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(percentile(timings, 0.95) * 1000, 3),
+        "throughput": round(items / p50, 1) if p50 else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def fresh_database(directory):
+    db.close()
+    path = os.path.join(directory, "bench.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db.DB_PATH = path
+    storage._imported = False
+    storage.DATA_PATH = os.path.join(directory, "members.json")
+    storage.USER_PATH = os.path.join(directory, "users.json")
+
+def clear_profile_cache():
+    with cache._memory_lock:
+        cache._memory.clear()
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM leetcode_cache")
+
+def bench_fetch_user_data(usernames, repeat):
+    # Per-call latency of the single-profile client
+    timings = []
+    for _ in range(repeat):
+        for username in usernames:
+            start = time.perf_counter()
+            leetcodeapi.fetch_user_data(username)
+            timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    leetcodeapi.fetch_user_data(usernames[0])
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    p50 = statistics.median(timings)
+    return {
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(percentile(timings, 0.95) * 1000, 3),
+        "throughput": round(1 / p50, 1) if p50 else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def bench_storage(backend, members, repeat):
+    storage.STORAGE_BACKEND = backend
+    results = {}
+    owner = f"bench-{backend}"
+    results["save_members"] = measure(lambda: storage.save_members(owner, members), repeat, len(members))
+    results["load_members"] = measure(lambda: storage.load_members(owner), repeat, len(members))
+    extra = [{"name": f"Extra {i}", "username": f"extra{i}"} for i in range(10)]
+
+    def reset():
+        storage.save_members(owner, members)
+
+    def add_each():
+        for member in extra:
+            storage.add_member(owner, member["name"], member["username"])
+    results["add_member"] = measure(add_each, repeat, len(extra), setup=reset)
+    storage.STORAGE_BACKEND = "sqlite"
+    return results
+
+def bench_dataframe(team, repeat):
+    def build():
+        board = leaderboard.compute_leaderboard(team)
+        return pd.DataFrame(board["rows"])
+    return measure(build, repeat, len(team))
+
+def run_suite(args, directory):
+    results = []
+
+    def record(scenario, size, result):
+        results.append({"scenario": scenario, "size": size, **result})
+        print(f"{scenario:<28} {size:>6} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+              f"{result['throughput'] or 0:>12.1f} {result['peak_kib']:>10.1f}")
+
+    print(f"{'scenario':<28} {'size':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'items/s':>12} {'peak KiB':>10}")
+    with StubServer(latency=args.latency, throttle_rate=args.throttle_rate,
+                    error_rate=args.error_rate, seed=args.seed) as server:
+        leetcodeapi.API_URL = server.url
+        leetcodeapi.reset_session()
+        for size in args.sizes:
+            fresh_database(directory)
+            usernames = [f"user{i}" for i in range(size)]
+            members = [{"name": f"Member {i}", "username": u} for i, u in enumerate(usernames)]
+
+            record("fetch_user_data", size, bench_fetch_user_data(usernames[:min(size, 20)], args.repeat))
+            record("fetch_all_data_cold", size, measure(
+                lambda: cache.fetch_all_data(members, team="bench"), args.repeat, size, setup=clear_profile_cache))
+            record("fetch_all_data_warm", size, measure(
+                lambda: cache.fetch_all_data(members, team="bench"), args.repeat, size))
+            for backend in ("sqlite", "json"):
+                for name, result in bench_storage(backend, members, args.repeat).items():
+                    record(f"storage_{backend}_{name}", size, result)
+            record("leaderboard_dataframe", size, bench_dataframe(synthetic_team(size), args.repeat))
+        http = leetcodeapi.http_stats()
+    return results, {"server_requests": server.requests, "retries": http["retries"],
+                     "throttled": http["throttled"], "server_errors": http["server_errors"]}
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path, tolerance):
+    # Latency regressions beyond tolerance (0.25 = 25% slower than baseline)
+    with open(baseline_path) as f:
+        baseline = {(r["scenario"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get((result["scenario"], result["size"]))
+        if not before or not before["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append((result["scenario"], result["size"], before["p50_ms"], result["p50_ms"], ratio))
+    for scenario, size, before, after, ratio in regressions:
+        print(f"REGRESSION {scenario} size={size}: {before:.2f} ms -> {after:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub latency per request (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    # Measure the client itself, not the production rate budget
+    leetcodeapi.rate_limiter.set_rate(None, 1)
+    leetcodeapi.BACKOFF_BASE = 0.01
+
+    directory = tempfile.mkdtemp(prefix="leetcode-bench-")
+    try:
+        results, http = run_suite(args, directory)
+    finally:
+        db.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "options": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "tolerance")},
+        "http": http,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
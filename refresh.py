@@ -0,0 +1,44 @@
+import argparse
+import time
+
+from utils import catalog, refresher
+
+# Standalone profile refresher, e.g. for cron or a sidecar process:
+#   python refresh.py --once
+#   python refresh.py --interval 300
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm cached LeetCode profiles for every team")
+    parser.add_argument("--once", action="store_true", help="run a single refresh cycle and exit")
+    parser.add_argument("--interval", type=int, default=refresher.REFRESH_INTERVAL,
+                        help="seconds between refresh cycles")
+    parser.add_argument("--max-profiles", type=int, default=refresher.MAX_PER_CYCLE,
+                        help="upper bound on profiles refreshed per cycle")
+    parser.add_argument("--refresh-after", type=int, default=refresher.REFRESH_AFTER,
+                        help="refresh profiles older than this many seconds")
+    args = parser.parse_args()
+
+    refresher.MAX_PER_CYCLE = args.max_profiles
+    refresher.REFRESH_AFTER = args.refresh_after
+
+    def log(message):
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+    if args.once:
+        start = time.monotonic()
+        refreshed, failed = refresher.refresh_once(args.max_profiles, args.refresh_after)
+        synced = refresher.sync_activity_once(args.max_profiles)
+        catalog.sync_catalog()
+        log(f"refreshed {len(refreshed)} profiles, {len(failed)} failed, "
+            f"synced activity for {synced['members']} ({synced['submissions']} new submissions) "
+            f"in {time.monotonic() - start:.1f}s")
+        if failed:
+            log("failed: " + ", ".join(failed))
+        return
+    try:
+        refresher.run_forever(args.interval, log=log)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
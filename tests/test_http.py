@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from utils import leetcodeapi
+
+# Retry, Retry-After, timeout and reset handling of the shared HTTP client,
+# against the stub server with a fixed fault schedule per test.
+
+@pytest.fixture(autouse=True)
+def fast_client(monkeypatch):
+    monkeypatch.setattr(leetcodeapi, "BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(leetcodeapi, "READ_TIMEOUT", 0.5)
+    monkeypatch.setattr(leetcodeapi, "rate_limiter", leetcodeapi.TokenBucket(None, 1))
+    leetcodeapi.reset_session()
+    yield
+    leetcodeapi.reset_session()
+
+def fetch(schedule, **options):
+    # (profile, http stat deltas, seconds, server)
+    with StubServer(schedule=schedule, **options) as server:
+        previous_url = leetcodeapi.API_URL
+        leetcodeapi.API_URL = server.url
+        try:
+            before = leetcodeapi.http_stats()
+            start = time.perf_counter()
+            profile = leetcodeapi.fetch_user_data("alice")
+            elapsed = time.perf_counter() - start
+            after = leetcodeapi.http_stats()
+        finally:
+            leetcodeapi.API_URL = previous_url
+    delta = {k: after[k] - before[k] for k in before if isinstance(before[k], int)}
+    return profile, delta, elapsed, server
+
+def test_clean_request_is_not_retried():
+    profile, delta, _elapsed, server = fetch([])
+    assert profile is not None and profile.username == "alice"
+    assert delta["requests"] == 1 and delta["retries"] == 0
+    assert server.requests == 1
+
+def test_throttled_requests_are_retried():
+    profile, delta, _elapsed, server = fetch(["throttle", "throttle"])
+    assert profile is not None
+    assert delta["throttled"] == 2 and delta["retries"] == 2
+    assert server.requests == 3
+
+def test_server_errors_are_retried():
+    profile, delta, _elapsed, _server = fetch(["error"])
+    assert profile is not None
+    assert delta["server_errors"] == 1 and delta["retries"] == 1
+
+def test_retries_stop_after_max_retries():
+    profile, delta, _elapsed, server = fetch(["error"] * (leetcodeapi.MAX_RETRIES + 2))
+    assert profile is None
+    assert server.requests == leetcodeapi.MAX_RETRIES + 1
+    assert delta["failures"] == 1
+
+def test_retry_after_is_honoured(monkeypatch):
+    monkeypatch.setattr(leetcodeapi, "BACKOFF_BASE", 0)
+    profile, _delta, elapsed, _server = fetch(["throttle"], retry_after=1)
+    assert profile is not None
+    assert elapsed >= 1
+
+def test_retry_after_is_capped(monkeypatch):
+    monkeypatch.setattr(leetcodeapi, "BACKOFF_MAX", 0.2)
+    profile, _delta, elapsed, _server = fetch(["throttle"], retry_after=30)
+    assert profile is not None
+    assert elapsed < 2
+
+def test_read_timeout_is_retried():
+    profile, delta, _elapsed, _server = fetch(["slow"], slow_latency=1.5)
+    assert profile is not None
+    assert delta["timeouts"] == 1 and delta["retries"] == 1
+
+def test_connection_reset_is_retried():
+    profile, delta, _elapsed, _server = fetch(["reset"])
+    assert profile is not None
+    assert delta["connection_errors"] == 1 and delta["retries"] == 1
+
+def test_persistent_resets_raise():
+    with pytest.raises(leetcodeapi.requests.ConnectionError):
+        fetch(["reset"] * (leetcodeapi.MAX_RETRIES + 1))
@@ -0,0 +1,29 @@
+import json
+import multiprocessing
+
+from benchmarks.stress_json_store import add_members
+
+# Concurrent writers on the JSON backend; a small run of
+# benchmarks.stress_json_store (the worker asserts every add succeeds and
+# that the file is valid JSON after each one).
+
+PROCESSES = 4
+MEMBERS = 25
+
+def test_concurrent_adds_are_not_lost(tmp_path):
+    path = tmp_path / "members.json"
+    path.write_text(json.dumps({}))
+    workers = [
+        multiprocessing.Process(target=add_members, args=(str(path), w, MEMBERS))
+        for w in range(PROCESSES)
+    ]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(timeout=60)
+
+    assert [p.exitcode for p in workers] == [0] * PROCESSES
+    all_members = json.loads(path.read_text())
+    usernames = [m["username"] for members in all_members.values() for m in members]
+    assert sorted(usernames) == sorted(f"user_{w}_{i}" for w in range(PROCESSES) for i in range(MEMBERS))
+    assert not [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
@@ -0,0 +1,38 @@
+import argparse
+import os
+
+from utils import transfer
+
+# Bulk export/import of team stats:
+#   python transfer.py export exports/ --format parquet
+#   python transfer.py import exports/profiles.parquet exports/snapshots.parquet --with-members
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import team stats")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="write profiles and snapshots to a directory")
+    export_parser.add_argument("directory")
+    export_parser.add_argument("--format", choices=sorted(transfer.FORMATS), default=transfer.default_format())
+
+    import_parser = commands.add_parser("import", help="seed the cache from exported files")
+    import_parser.add_argument("files", nargs="+", help="profiles.* and/or snapshots.* files")
+    import_parser.add_argument("--with-members", action="store_true",
+                               help="also add the exported members to their teams")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        for path, rows in transfer.export_all(args.directory, args.format).items():
+            print(f"wrote {rows} rows to {path}")
+        return
+
+    for path in args.files:
+        name = os.path.basename(path)
+        if name.startswith("snapshots"):
+            print(f"{path}: imported {transfer.import_snapshots(path)} snapshots")
+        else:
+            seeded, added = transfer.import_profiles(path, args.with_members)
+            print(f"{path}: seeded {seeded} cached profiles, added {added} members")
+
+if __name__ == "__main__":
+    main()
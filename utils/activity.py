@@ -0,0 +1,202 @@
+import time
+
+from utils import db
+from utils.leetcodeapi import fetch_activity_chunk, fetch_contest_history_chunk, schedule_chunks
+from utils.snapshots import DAY
+
+# Per-member activity beyond the profile counts: the daily submission
+# calendar, recent accepted submissions and contest history, stored in the
+# tables created in utils.db. Sync is incremental: each member keeps cursors in
+# activity_sync (newest calendar day, newest accepted submission, contests
+# seen), only rows past those cursors are written, and contest history is only
+# requested when the attended count grew. Members whose solved/attempted totals
+# did not change since their last sync are skipped entirely, so a refresh
+# costs in proportion to new activity.
+
+def _signature(profile):
+    return (profile.total_solved, profile.total_attempted)
+
+def _chunks(items, size=500):
+    # Stay well under SQLite's bound-parameter limit
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _sync_state(conn, usernames):
+    state = {}
+    for chunk in _chunks(usernames):
+        rows = conn.execute(
+            "SELECT username, total_solved, total_attempted, calendar_cursor, ac_cursor, "
+            "contests_attended, contest_cursor FROM activity_sync "
+            f"WHERE username IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchall()
+        for username, solved, attempted, calendar_cursor, ac_cursor, attended, contest_cursor in rows:
+            state[username] = {
+                "signature": (solved, attempted),
+                "calendar_cursor": calendar_cursor,
+                "ac_cursor": ac_cursor,
+                "contests_attended": attended,
+                "contest_cursor": contest_cursor,
+            }
+    return state
+
+def due_for_sync(profiles):
+    # profiles: {username: profile}; usernames never synced or whose totals moved
+    profiles = {u: p for u, p in profiles.items() if p is not None}
+    with db.transaction() as conn:
+        state = _sync_state(conn, profiles)
+    return [
+        username for username, profile in profiles.items()
+        if username not in state or state[username]["signature"] != _signature(profile)
+    ]
+
+def sync_profiles(profiles, team=None, force=False):
+    # profiles: {username: profile}. Returns counts of what was fetched and stored.
+    usernames = list(profiles) if force else due_for_sync(profiles)
+    stats = {"members": len(usernames), "failed": 0, "calendar_days": 0, "submissions": 0, "contests": 0}
+    if not usernames:
+        return stats
+    fetched = schedule_chunks(usernames, fetch_activity_chunk, team=team)
+    with db.transaction() as conn:
+        state = _sync_state(conn, usernames)
+    history_due = [
+        username for username, activity in fetched.items()
+        if activity and ((activity["contest"] or {}).get("attendedContestsCount") or 0)
+        > state.get(username, {}).get("contests_attended", 0)
+    ]
+    histories = schedule_chunks(history_due, fetch_contest_history_chunk, team=team) if history_due else {}
+
+    now = time.time()
+    with db.transaction() as conn:
+        for username in usernames:
+            activity = fetched.get(username)
+            if activity is None:
+                stats["failed"] += 1
+                continue
+            cursors = state.get(username, {})
+            # The newest stored day can still gain submissions, so it is rewritten
+            calendar_cursor = cursors.get("calendar_cursor")
+            days = [
+                (username, day, count) for day, count in activity["calendar"].items()
+                if calendar_cursor is None or day >= calendar_cursor
+            ]
+            conn.executemany(
+                "INSERT INTO submission_calendar (username, day, submissions) VALUES (?, ?, ?) "
+                "ON CONFLICT (username, day) DO UPDATE SET submissions = excluded.submissions",
+                days,
+            )
+            ac_cursor = cursors.get("ac_cursor")
+            submissions = [
+                (username, s["id"], s["titleSlug"], s["title"], s["timestamp"]) for s in activity["recent"]
+                if ac_cursor is None or s["timestamp"] > ac_cursor
+            ]
+            conn.executemany(
+                "INSERT OR IGNORE INTO ac_submissions (username, submission_id, title_slug, title, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                submissions,
+            )
+            # Solved slugs get a stable problem id (bit position) even before
+            # the catalogue sync has seen them
+            conn.executemany(
+                "INSERT OR IGNORE INTO problems (title_slug, title) VALUES (?, ?)",
+                [(s[2], s[3]) for s in submissions],
+            )
+            contest = activity["contest"] or {}
+            contest_cursor = cursors.get("contest_cursor")
+            contests = [
+                (username, c["startTime"], c["title"], c["rating"], c["ranking"])
+                for c in histories.get(username) or []
+                if contest_cursor is None or c["startTime"] > contest_cursor
+            ]
+            conn.executemany(
+                "INSERT OR IGNORE INTO contest_history (username, start_time, title, rating, ranking) "
+                "VALUES (?, ?, ?, ?, ?)",
+                contests,
+            )
+            # A failed history fetch keeps the old attended count so it is retried
+            attended = contest.get("attendedContestsCount") or 0
+            if username in history_due and histories.get(username) is None:
+                attended = cursors.get("contests_attended", 0)
+            solved, attempted = _signature(profiles[username])
+            conn.execute(
+                "INSERT OR REPLACE INTO activity_sync (username, total_solved, total_attempted, "
+                "calendar_cursor, ac_cursor, contests_attended, contest_cursor, contest_rating, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    username, solved, attempted,
+                    max([calendar_cursor or 0] + [d[1] for d in days]) or None,
+                    max([ac_cursor or 0] + [s[4] for s in submissions]) or None,
+                    attended,
+                    max([contest_cursor or 0] + [c[1] for c in contests]) or None,
+                    contest.get("rating"),
+                    now,
+                ),
+            )
+            stats["calendar_days"] += len(days)
+            stats["submissions"] += len(submissions)
+            stats["contests"] += len(contests)
+    return stats
+
+def calendar(usernames, since):
+    # {day_start: submissions} summed over usernames, for days >= since
+    totals = {}
+    with db.transaction() as conn:
+        for chunk in _chunks(dict.fromkeys(usernames)):
+            rows = conn.execute(
+                "SELECT day, SUM(submissions) FROM submission_calendar "
+                f"WHERE username IN ({','.join('?' * len(chunk))}) AND day >= ? GROUP BY day",
+                chunk + [since],
+            ).fetchall()
+            for day, count in rows:
+                totals[day] = totals.get(day, 0) + count
+    return totals
+
+def active_since(usernames, since):
+    # Usernames with at least one submission on a calendar day >= since
+    active = set()
+    with db.transaction() as conn:
+        for chunk in _chunks(dict.fromkeys(usernames)):
+            rows = conn.execute(
+                "SELECT DISTINCT username FROM submission_calendar "
+                f"WHERE username IN ({','.join('?' * len(chunk))}) AND day >= ? AND submissions > 0",
+                chunk + [since],
+            ).fetchall()
+            active.update(username for (username,) in rows)
+    return active
+
+def recent_submissions(username, limit=10):
+    # [(title, title_slug, timestamp)] newest first
+    with db.transaction() as conn:
+        return conn.execute(
+            "SELECT title, title_slug, timestamp FROM ac_submissions WHERE username = ? "
+            "ORDER BY timestamp DESC LIMIT ?",
+            (username, limit),
+        ).fetchall()
+
+def contest_summary(username):
+    # (rating, attended, [(start_time, title, rating, ranking)] oldest first) or None
+    with db.transaction() as conn:
+        row = conn.execute(
+            "SELECT contest_rating, contests_attended FROM activity_sync WHERE username = ?",
+            (username,),
+        ).fetchone()
+        if row is None or not row[1]:
+            return None
+        contests = conn.execute(
+            "SELECT start_time, title, rating, ranking FROM contest_history WHERE username = ? "
+            "ORDER BY start_time",
+            (username,),
+        ).fetchall()
+    return row[0], row[1], contests
+
+def streak(username, today=None):
+    # Consecutive days with submissions ending today (or yesterday)
+    today = (int(time.time() if today is None else today) // DAY) * DAY
+    days = {day for day, count in calendar([username], today - 365 * DAY).items() if count > 0}
+    if today not in days:
+        today -= DAY
+    count = 0
+    while today in days:
+        count += 1
+        today -= DAY
+    return count
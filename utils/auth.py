@@ -1,33 +1,134 @@
-import os
-import json
+import base64
 import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+
+from utils import db, storage
+
+# Passwords are stored as "scrypt$n$r$p$salt$hash" (or "pbkdf2$iterations$salt$hash"
+# where hashlib has no scrypt). The cost comes from DASHBOARD_KDF_COST, the
+# scrypt n (a power of two); benchmarks.bench_auth shows what each cost does
+# to login latency under concurrent logins. Hashes from older releases
+# (unsalted SHA-256) and hashes with outdated parameters still verify, and are
+# replaced with a current hash on the next successful login.
+#
+# A successful login issues a signed session token kept in session state;
+# reruns check its HMAC instead of the password.
 
-USER_PATH = "data/users.json"
+KDF_COST = int(os.environ.get("DASHBOARD_KDF_COST", 2 ** 14))
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600_000
+SALT_BYTES = 16
+SESSION_TTL = 7 * 24 * 60 * 60
 
-def load_users():
-    if not os.path.exists(USER_PATH):
-        return {}
-    with open(USER_PATH, "r") as f:
-        return json.load(f)
+_secret = None
+_secret_lock = threading.Lock()
 
-def save_users(users):
-    with open(USER_PATH, "w") as f:
-        json.dump(users, f, indent=4)
+def _scrypt(password, salt, n, r, p):
+    # OpenSSL's default 32 MiB maxmem stops at n = 2**14 with r = 8
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, maxmem=2 * 128 * n * r * p + (1 << 20)
+    )
 
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+def hash_password(password, cost=None):
+    salt = secrets.token_bytes(SALT_BYTES)
+    if hasattr(hashlib, "scrypt"):
+        n = cost or KDF_COST
+        digest = _scrypt(password, salt, n, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+    iterations = cost or PBKDF2_ITERATIONS
+    return f"pbkdf2${iterations}${salt.hex()}${_pbkdf2(password, salt, iterations).hex()}"
+
+def verify_password(password, stored):
+    # (matches, needs_rehash)
+    if not stored:
+        return False, False
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = (int(v) for v in parts[1:4])
+            digest = _scrypt(password, bytes.fromhex(parts[4]), n, r, p)
+            current = hasattr(hashlib, "scrypt") and (n, r, p) == (KDF_COST, SCRYPT_R, SCRYPT_P)
+        elif parts[0] == "pbkdf2" and len(parts) == 4:
+            iterations = int(parts[1])
+            digest = _pbkdf2(password, bytes.fromhex(parts[2]), iterations)
+            current = not hasattr(hashlib, "scrypt") and iterations == PBKDF2_ITERATIONS
+        else:
+            # Legacy unsalted SHA-256 hex digest
+            legacy = hashlib.sha256(password.encode()).hexdigest()
+            matches = hmac.compare_digest(legacy, stored)
+            return matches, matches
+        expected = bytes.fromhex(parts[-1])
+    except ValueError:
+        return False, False
+    matches = hmac.compare_digest(digest, expected)
+    return matches, matches and not current
 
 def register(username, password):
-    users = load_users()
-    if username in users:
-        return False
-    users[username] = hash_password(password)
-    save_users(users)
-    return True
+    return storage.create_user(username, hash_password(password))
 
 def login(username, password):
-    users = load_users()
-    return users.get(username) == hash_password(password)
+    matches, needs_rehash = verify_password(password, storage.get_password_hash(username))
+    if needs_rehash:
+        storage.set_password_hash(username, hash_password(password))
+    return matches
+
+# --- Sessions ---
+
+def _secret_key():
+    # DASHBOARD_SECRET, or a random key generated once and kept in the meta
+    # table so tokens survive restarts and are shared between processes
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            env = os.environ.get("DASHBOARD_SECRET")
+            if env:
+                _secret = env.encode()
+            else:
+                with db.transaction() as conn:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO meta (key, value) VALUES ('session_secret', ?)",
+                        (secrets.token_hex(32),),
+                    )
+                    _secret = conn.execute("SELECT value FROM meta WHERE key = 'session_secret'").fetchone()[0].encode()
+        return _secret
+
+def _sign(payload):
+    return hmac.new(_secret_key(), payload, hashlib.sha256).hexdigest()
+
+def issue_token(username, ttl=SESSION_TTL):
+    payload = base64.urlsafe_b64encode(f"{int(time.time() + ttl)}:{username}".encode())
+    return f"{payload.decode()}.{_sign(payload)}"
+
+def verify_token(token):
+    # The token's username, or None if it is malformed, forged or expired
+    if not token or "." not in token:
+        return None
+    payload, signature = token.rsplit(".", 1)
+    if not hmac.compare_digest(_sign(payload.encode()), signature):
+        return None
+    try:
+        expires, username = base64.urlsafe_b64decode(payload).decode().split(":", 1)
+        expires = int(expires)
+    except ValueError:
+        return None
+    return username if expires > time.time() else None
+
+def start_session(session_state, username):
+    session_state.user = username
+    session_state.session_token = issue_token(username)
+
+def end_session(session_state):
+    session_state.user = None
+    session_state.session_token = None
 
 def get_current_user(session_state):
-    return session_state.get("user", None)
+    user = verify_token(session_state.get("session_token"))
+    return user if user is not None and user == session_state.get("user") else None
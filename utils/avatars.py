@@ -0,0 +1,162 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.leetcodeapi import get_session
+
+try:
+    from PIL import Image
+except ImportError:  # Thumbnails fall back to the original bytes
+    Image = None
+
+# Local avatar thumbnails. Each avatar is downloaded once, resized to the
+# size it is displayed at (2x for high-DPI screens) and stored on disk keyed
+# by a hash of its URL. Downloads happen on a background pool, never on the
+# render path: until a thumbnail exists the original URL is returned and the
+# browser loads it from the CDN. Entries older than AVATAR_TTL keep being
+# served while they are revalidated with ETag / Last-Modified, and a failed
+# download is not retried for FAILURE_TTL.
+AVATAR_DIR = "data/avatars"
+AVATAR_TTL = 24 * 60 * 60
+FAILURE_TTL = 5 * 60
+FETCH_TIMEOUT = (2, 3)
+MAX_WORKERS = 8
+MEMORY_ITEMS = 2048
+
+_memory = OrderedDict()
+_memory_lock = threading.Lock()
+_pending = set()
+_failures = {}
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="avatars")
+
+def _paths(url, size):
+    digest = hashlib.sha256(url.encode()).hexdigest()[:32]
+    base = os.path.join(AVATAR_DIR, f"{digest}_{size}")
+    return base + ".img", base + ".json"
+
+def _thumbnail(raw, size, content_type=None):
+    # Returns (bytes, mime type). Images Pillow cannot decode (or all images,
+    # without Pillow) are kept as-is with the server's Content-Type, e.g. SVG.
+    original = (content_type or "").split(";")[0].strip().lower()
+    original = original if original.startswith("image/") else "image/png"
+    if Image is None:
+        return raw, original
+    try:
+        with Image.open(io.BytesIO(raw)) as image:
+            image = image.convert("RGBA")
+            image.thumbnail((size * 2, size * 2))
+            out = io.BytesIO()
+            try:
+                image.save(out, format="WEBP", quality=80)
+                return out.getvalue(), "image/webp"
+            except (OSError, KeyError):
+                out = io.BytesIO()
+                image.save(out, format="PNG", optimize=True)
+                return out.getvalue(), "image/png"
+    except OSError:
+        return raw, original
+
+def _data_uri(data, mime):
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+def _read(url, size):
+    image_path, meta_path = _paths(url, size)
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        with open(image_path, "rb") as f:
+            return f.read(), meta
+    except (OSError, ValueError):
+        return None, None
+
+def _write(url, size, data, meta):
+    os.makedirs(AVATAR_DIR, exist_ok=True)
+    image_path, meta_path = _paths(url, size)
+    for path, payload, mode in ((image_path, data, "wb"), (meta_path, json.dumps(meta), "w")):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, mode) as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+def _remember(key, uri, fetched_at):
+    with _memory_lock:
+        _memory[key] = (uri, fetched_at)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ITEMS:
+            _memory.popitem(last=False)
+
+def _download(url, size):
+    # Background (re)validation of one avatar; the result lands in memory and
+    # on disk for the next render. A failure is remembered for FAILURE_TTL.
+    key = (url, size)
+    try:
+        data, meta = _read(url, size)
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = get_session().get(url, headers=headers, timeout=FETCH_TIMEOUT)
+        except Exception:
+            response = None
+
+        if response is not None and response.status_code == 304 and data is not None:
+            meta["fetched_at"] = time.time()
+        elif response is not None and response.status_code == 200:
+            data, mime = _thumbnail(response.content, size, response.headers.get("Content-Type"))
+            meta = {
+                "url": url,
+                "mime": mime,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+        else:
+            with _memory_lock:
+                _failures[key] = time.time()
+            return
+        _write(url, size, data, meta)
+        _remember(key, _data_uri(data, meta.get("mime", "image/png")), meta["fetched_at"])
+        with _memory_lock:
+            _failures.pop(key, None)
+    finally:
+        with _memory_lock:
+            _pending.discard(key)
+
+def _schedule(url, size):
+    key = (url, size)
+    with _memory_lock:
+        if key in _pending or time.time() - _failures.get(key, 0) < FAILURE_TTL:
+            return
+        _pending.add(key)
+    _executor.submit(_download, url, size)
+
+def avatar_data_uri(url, size):
+    # Data URI for the avatar thumbnail, or `url` itself until one exists.
+    # Never blocks on the network: cold and expired avatars are fetched in
+    # the background and show up on a later render.
+    if not url or url.startswith("data:"):
+        return url
+    key = (url, size)
+    with _memory_lock:
+        entry = _memory.get(key)
+    if entry is None:
+        data, meta = _read(url, size)
+        if data is not None:
+            entry = (_data_uri(data, meta.get("mime", "image/png")), meta.get("fetched_at", 0))
+            _remember(key, *entry)
+    if entry is None or time.time() - entry[1] >= AVATAR_TTL:
+        _schedule(url, size)
+    return entry[0] if entry else url
+
+def avatar_data_uris(urls, size):
+    # {url: data uri or url}
+    return {u: avatar_data_uri(u, size) for u in dict.fromkeys(urls) if u}
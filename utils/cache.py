@@ -0,0 +1,248 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError, as_completed
+
+from utils import db, metrics, snapshots
+from utils.profile import decode
+from utils.leetcodeapi import schedule_users_data, schedule_users_futures
+
+# Profiles younger than CACHE_TTL seconds are served as-is. Older entries up
+# to STALE_TTL are still served immediately but refreshed in the background
+# (stale-while-revalidate); anything older is refetched before returning.
+CACHE_TTL = 15 * 60
+STALE_TTL = 24 * 60 * 60
+# Seconds the dashboard waits for a member's fetch before showing them as stale
+# (read on each call, so it can be changed at runtime)
+MEMBER_TIMEOUT = 10
+
+_stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+_stats_lock = threading.Lock()
+# Per-username in-process layer in front of SQLite: {username: (data, stored_at)}
+_memory = {}
+_memory_lock = threading.Lock()
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _count(key, n=1):
+    with _stats_lock:
+        _stats[key] += n
+
+def read_cache(usernames):
+    # Returns {username: (data, age_in_seconds)} for cached usernames
+    usernames = list(usernames)
+    if not usernames:
+        return {}
+    entries = {}
+    with db.transaction() as conn:
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(usernames), 500):
+            chunk = usernames[i:i + 500]
+            rows = conn.execute(
+                "SELECT username, data, (julianday('now') - julianday(last_updated)) * 86400 "
+                f"FROM leetcode_cache WHERE username IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for username, data, age in rows:
+                entries[username] = (decode(data), age)
+    return entries
+
+def _remember(profiles, stored_at=None):
+    stored_at = time.time() if stored_at is None else stored_at
+    with _memory_lock:
+        for username, data in profiles.items():
+            _memory[username] = (data, stored_at)
+
+def _recall(usernames, ttl):
+    now = time.time()
+    with _memory_lock:
+        entries = {u: _memory.get(u) for u in usernames}
+    return {u: e[0] for u, e in entries.items() if e is not None and now - e[1] <= ttl}
+
+def write_cache(profiles):
+    # profiles: {username: MemberProfile}; None values are skipped. Stored
+    # packed (see utils.profile); rows still holding JSON decode as before.
+    profiles = {u: d for u, d in profiles.items() if d is not None}
+    if not profiles:
+        return
+    _remember(profiles)
+    rows = [(u, d.pack()) for u, d in profiles.items()]
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO leetcode_cache (username, data, last_updated) "
+            "VALUES (?, ?, CURRENT_TIMESTAMP) "
+            "ON CONFLICT(username) DO UPDATE SET "
+            "data = excluded.data, last_updated = excluded.last_updated",
+            rows,
+        )
+        snapshots.record_snapshots(conn, profiles)
+
+def record_views(usernames):
+    # Dashboard views drive the background refresher's priority order
+    rows = [(u,) for u in dict.fromkeys(usernames)]
+    if not rows:
+        return
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO leetcode_views (username, views, last_viewed) "
+            "VALUES (?, 1, CURRENT_TIMESTAMP) "
+            "ON CONFLICT(username) DO UPDATE SET "
+            "views = views + 1, last_viewed = CURRENT_TIMESTAMP",
+            rows,
+        )
+
+def cache_metadata():
+    # {username: (age_in_seconds or None, views)} for every cached or viewed username
+    metadata = {}
+    with db.transaction() as conn:
+        for username, age in conn.execute(
+            "SELECT username, (julianday('now') - julianday(last_updated)) * 86400 FROM leetcode_cache"
+        ):
+            metadata[username] = (age, 0)
+        for username, views in conn.execute("SELECT username, views FROM leetcode_views"):
+            metadata[username] = (metadata.get(username, (None, 0))[0], views)
+    return metadata
+
+def _refresh(usernames, team=None):
+    try:
+        results = schedule_users_data(usernames, team=team)
+        write_cache(results)
+        _count("refreshes", len(usernames))
+    except Exception:
+        _count("errors")
+    finally:
+        with _refreshing_lock:
+            _refreshing.difference_update(usernames)
+
+def _refresh_in_background(usernames, team=None):
+    with _refreshing_lock:
+        usernames = [u for u in usernames if u not in _refreshing]
+        _refreshing.update(usernames)
+    if usernames:
+        threading.Thread(target=_refresh, args=(usernames, team), daemon=True).start()
+
+def _result(future):
+    try:
+        return future.result()
+    except Exception:
+        return None
+
+def _cache_when_done(username, future):
+    # A fetch that outlived its caller still lands in the cache
+    future.add_done_callback(lambda f: write_cache({username: _result(f)}))
+
+def iter_users_data(usernames, ttl=CACHE_TTL, stale_ttl=STALE_TTL, team=None, timeout=None):
+    # Streaming get_users_data: yields (username, profile or None, status) as
+    # each member becomes known. Cached profiles come first, "fresh" or, past
+    # ttl, "stale" while a background refresh runs. Every other member is then
+    # announced as "loading" (with an expired copy when there is one) before
+    # any waiting, and yielded again in completion order as "fetched", or
+    # when LeetCode has no data as "expired" with the expired copy or else
+    # "failed". Members still loading after timeout seconds are yielded as
+    # "timeout" (with the expired copy, if any) and cached whenever their
+    # fetch finishes.
+    usernames = list(dict.fromkeys(usernames))
+    results = _recall(usernames, ttl)
+    _count("hits", len(results))
+    entries = read_cache([u for u in usernames if u not in results])
+    now = time.time()
+    cached = {}
+    missing = []
+    stale = []
+    for username in usernames:
+        if username in results:
+            cached[username] = (results[username], "fresh")
+            continue
+        entry = entries.get(username)
+        if entry is None or entry[1] > max(ttl, stale_ttl):
+            missing.append(username)
+            continue
+        data, age = entry
+        if age > ttl:
+            stale.append(username)
+            cached[username] = (data, "stale")
+        else:
+            # Promote fresh SQLite entries so the next run skips the DB
+            _remember({username: data}, now - age)
+            _count("hits")
+            cached[username] = (data, "fresh")
+    _count("stale_hits", len(stale))
+    _count("misses", len(missing))
+
+    # Fetches are queued before anything is yielded so they overlap rendering
+    pending = {future: u for u, future in schedule_users_futures(missing, team=team).items()} if missing else {}
+    if stale:
+        _refresh_in_background(stale, team)
+    fetched = {}
+    try:
+        for username, (data, status) in cached.items():
+            yield username, data, status
+        # Fall back to an expired copy rather than dropping the member
+        expired = {u: entries[u][0] for u in missing if u in entries}
+        for username in missing:
+            yield username, expired.get(username), "loading"
+        try:
+            for future in as_completed(list(pending), timeout=timeout):
+                username = pending.pop(future)
+                data = _result(future)
+                if data is not None:
+                    fetched[username] = data
+                    yield username, data, "fetched"
+                elif username in expired:
+                    yield username, expired[username], "expired"
+                else:
+                    yield username, None, "failed"
+        except FutureTimeoutError:
+            for username in list(pending.values()):
+                yield username, expired.get(username), "timeout"
+    finally:
+        write_cache(fetched)
+        for future, username in pending.items():
+            _cache_when_done(username, future)
+
+def get_users_data(usernames, ttl=CACHE_TTL, stale_ttl=STALE_TTL, team=None):
+    # Cached counterpart of fetch_users_data: {username: profile or None}
+    usernames = list(dict.fromkeys(usernames))
+    results = {u: data for u, data, _status in iter_users_data(usernames, ttl, stale_ttl, team)}
+    return {u: results.get(u) for u in usernames}
+
+def get_user_data(username, ttl=CACHE_TTL, stale_ttl=STALE_TTL, team=None):
+    return get_users_data([username], ttl, stale_ttl, team)[username]
+
+def fetch_all_data(members, team=None):
+    # All members' data as flat leaderboard rows. Profiles are cached per
+    # LeetCode username, so editing the member list only fetches newly added
+    # usernames; display names are joined in afterwards and never invalidate
+    # a profile.
+    usernames = [m["username"] for m in members]
+    record_views(usernames)
+    results = get_users_data(usernames, team=team)
+    data = []
+    for member in members:
+        user_data = results.get(member["username"])
+        if user_data:
+            data.append(user_data.to_row(member.get("name", member["username"])))
+    return data
+
+def iter_all_data(members, team=None, timeout=None):
+    # Streaming fetch_all_data: yields (username, row or None, status) with
+    # the statuses of iter_users_data, waiting at most timeout (default
+    # MEMBER_TIMEOUT) seconds. Rows holding an expired copy (status "loading",
+    # "timeout" or "expired") carry stale=True
+    names = {m["username"]: m.get("name", m["username"]) for m in members}
+    record_views(names)
+    timeout = MEMBER_TIMEOUT if timeout is None else timeout
+    for username, data, status in iter_users_data(list(names), team=team, timeout=timeout):
+        row = None
+        if data is not None:
+            row = data.to_row(names[username])
+            row["stale"] = status in ("loading", "timeout", "expired")
+        yield username, row, status
+
+def cache_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+    stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else None
+    return stats
+
+metrics.register_collector("cache", cache_stats)
@@ -0,0 +1,38 @@
+import time
+
+from utils import db
+from utils.leetcodeapi import fetch_problem_catalog
+
+# LeetCode's problem list in the problems table: title, difficulty and topics
+# per slug, for utils.problems. Kept apart from that module so the background
+# refresher can sync it without importing numpy.
+
+CATALOG_TTL = 7 * 24 * 60 * 60
+
+def sync_catalog(force=False):
+    # Upserts LeetCode's problem list at most every CATALOG_TTL seconds;
+    # returns the number of problems written (0 when fresh or on failure)
+    with db.transaction() as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'problems_synced_at'").fetchone()
+    if not force and row and time.time() - float(row[0]) < CATALOG_TTL:
+        return 0
+    catalog = fetch_problem_catalog()
+    if not catalog:
+        return 0
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO problems (title_slug, frontend_id, title, difficulty, topics) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (title_slug) DO UPDATE SET frontend_id = excluded.frontend_id, "
+            "title = excluded.title, difficulty = excluded.difficulty, topics = excluded.topics",
+            [
+                (
+                    p["titleSlug"], p.get("frontendQuestionId"), p.get("title"), p.get("difficulty"),
+                    ",".join(t["name"] for t in p.get("topicTags") or []),
+                )
+                for p in catalog
+            ],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('problems_synced_at', ?)", (str(time.time()),)
+        )
+    return len(catalog)
@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import OrderedDict
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from utils import metrics
+from utils.snapshots import DAY
+
+# Plotly figure builders for the dashboard. The team bar chart and the
+# per-member pie are memoized on the data they plot, so a rerun that only
+# changes the selected member reuses both figures. Cached figures are shared
+# between sessions: render them, do not mutate them.
+
+CACHE_SIZE = 64
+# Bars drawn by default; larger teams show the top members only
+TEAM_BAR_TOP_N = 50
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _cached(key, build):
+    with _cache_lock:
+        fig = _cache.get(key)
+        if fig is not None:
+            _cache.move_to_end(key)
+    if fig is not None:
+        metrics.count("chart_cache_hits")
+        return fig
+    fig = build()
+    with _cache_lock:
+        _cache[key] = fig
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return fig
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+def difficulty_pie(easy_count, medium_count, hard_count):
+    # None when the member has no solved problems
+    if not (easy_count or medium_count or hard_count):
+        return None
+    key = ("pie", easy_count, medium_count, hard_count)
+    return _cached(key, lambda: _difficulty_pie(easy_count, medium_count, hard_count))
+
+def team_bar(rows, top_n=TEAM_BAR_TOP_N):
+    # rows: ranked leaderboard rows (best first); top_n=None draws everyone
+    if top_n is not None:
+        rows = rows[:top_n]
+    key = ("bar", tuple((row["name"], row["totalSolved"]) for row in rows))
+    return _cached(key, lambda: _team_bar(rows))
+
+def activity_heatmap(days, today, weeks=26):
+    # days: {day_start_epoch: submissions}; GitHub-style weeks x weekdays grid
+    start = today - (weeks * 7 - 1) * DAY
+    cells = tuple((day, count) for day, count in sorted(days.items()) if day >= start)
+    key = ("heatmap", today, weeks, cells)
+    return _cached(key, lambda: _activity_heatmap(dict(cells), start, weeks))
+
+@metrics.instrument("plotly")
+def _activity_heatmap(days, start, weeks):
+    # Rows are weekdays (Mon..Sun), columns are weeks ending with this one
+    offset = time.gmtime(start).tm_wday
+    grid = [[None] * (weeks + 1) for _ in range(7)]
+    dates = [[""] * (weeks + 1) for _ in range(7)]
+    for k in range(weeks * 7):
+        day = start + k * DAY
+        row, col = (offset + k) % 7, (offset + k) // 7
+        grid[row][col] = days.get(day, 0)
+        dates[row][col] = time.strftime("%Y-%m-%d", time.gmtime(day))
+    fig = go.Figure(go.Heatmap(
+        z=grid,
+        customdata=dates,
+        y=["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        colorscale=[(0, "rgba(128,128,128,0.15)"), (0.01, "#0e4429"), (1, "#34A853")],
+        xgap=3,
+        ygap=3,
+        showscale=False,
+        hovertemplate="%{customdata}: %{z} submissions<extra></extra>",
+    ))
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=10, b=10),
+        height=180,
+        xaxis=dict(showticklabels=False, showgrid=False, zeroline=False),
+        yaxis=dict(autorange="reversed", showgrid=False, zeroline=False),
+    )
+    return fig
+
+@metrics.instrument("plotly")
+def _difficulty_pie(easy_count, medium_count, hard_count):
+    # Create data for pie chart
+    diff_data = [
+        {'difficulty': 'Easy', 'count': easy_count},
+        {'difficulty': 'Medium', 'count': medium_count},
+        {'difficulty': 'Hard', 'count': hard_count}
+    ]
+    
+    # Filter out zero counts
+    diff_data = [d for d in diff_data if d['count'] > 0]
+    
+    # Create pie chart with LeetCode colors
+    fig = px.pie(
+        diff_data,
+        values='count',
+        names='difficulty',
+        color='difficulty',
+        color_discrete_map={
+            'Easy': '#34A853',
+            'Medium': '#FFA116',
+            'Hard': '#EF4743'
+        },
+        hole=0.4,
+    )
+    
+    fig.update_layout(
+        showlegend=True,
+        margin=dict(l=20, r=20, t=30, b=0),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=12)
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12)
+    )
+    
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate="<b>%{label}</b><br>Solved: %{value}<br>Percentage: %{percent}",
+        textfont=dict(color='#FFFFFF', size=11)
+    )
+    return fig
+
+@metrics.instrument("plotly")
+def _team_bar(rows):
+    # Create bar chart with LeetCode colors
+    fig = px.bar(
+        {"name": [row["name"] for row in rows], "totalSolved": [row["totalSolved"] for row in rows]},
+        x='name',
+        y='totalSolved',
+        color='totalSolved',
+        color_continuous_scale=[(0, "#FFA116"), (1, "#34A853")],
+        text='totalSolved',
+        labels={'name': 'Team Members', 'totalSolved': 'Problems Solved'},
+        title="Team Members Performance Comparison"
+    )
+    
+    fig.update_layout(
+        xaxis_title="Team Members",
+        yaxis_title="Problems Solved",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=50, b=20),
+        xaxis=dict(tickangle=-45),
+        showlegend=False,
+        height=400,
+        title=dict(
+            font=dict(size=16),
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    
+    fig.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        marker_line_color='rgba(0,0,0,0.1)',
+        marker_line_width=1,
+        textfont=dict(size=12, color='#FFFFFF')
+    )
+    return fig
+
+@metrics.instrument("plotly")
+def progress_line(history_df):
+    fig = px.line(
+        history_df,
+        x="date",
+        y="totalSolved",
+        color="name",
+        line_shape="hv",
+        labels={"date": "Date", "totalSolved": "Problems Solved", "name": "Member"},
+        title="Progress (Last 30 Days)"
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=400,
+        title=dict(
+            font=dict(size=16),
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    return fig
+
+@metrics.instrument("plotly")
+def difficulty_mix(team_stats):
+    # Stacked difficulty shares for the given teams
+    mix = team_stats.melt(
+        id_vars="team",
+        value_vars=["easyShare", "mediumShare", "hardShare"],
+        var_name="difficulty",
+        value_name="share"
+    )
+    mix["difficulty"] = mix["difficulty"].str.replace("Share", "").str.title()
+    fig = px.bar(
+        mix,
+        x="team",
+        y="share",
+        color="difficulty",
+        color_discrete_map={'Easy': '#34A853', 'Medium': '#FFA116', 'Hard': '#EF4743'},
+        labels={"team": "Team", "share": "Share of Solved"},
+        title="Difficulty Mix by Team"
+    )
+    fig.update_layout(
+        barmode="stack",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=50, b=20),
+        xaxis=dict(tickangle=-45, type="category"),
+        height=400,
+        title=dict(font=dict(size=16), x=0.5, xanchor='center')
+    )
+    return fig
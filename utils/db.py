@@ -0,0 +1,327 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_PATH = "data/leetcode_dashboard.db"
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS teams (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        owner_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (owner_id) REFERENCES users (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_teams_owner_id ON teams (owner_id)",
+    """
+    CREATE TABLE IF NOT EXISTS members (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        team_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        leetcode_username TEXT NOT NULL,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (team_id) REFERENCES teams (id),
+        UNIQUE(team_id, leetcode_username)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leetcode_cache (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        data TEXT NOT NULL,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leetcode_views (
+        username TEXT PRIMARY KEY,
+        views INTEGER NOT NULL DEFAULT 0,
+        last_viewed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        taken_at REAL NOT NULL,
+        total_solved INTEGER NOT NULL,
+        easy INTEGER NOT NULL,
+        medium INTEGER NOT NULL,
+        hard INTEGER NOT NULL,
+        ranking INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_snapshots_username_taken_at ON snapshots (username, taken_at)",
+    """
+    CREATE TABLE IF NOT EXISTS activity_sync (
+        username TEXT PRIMARY KEY,
+        total_solved INTEGER,
+        total_attempted INTEGER,
+        calendar_cursor INTEGER,
+        ac_cursor INTEGER,
+        contests_attended INTEGER NOT NULL DEFAULT 0,
+        contest_cursor INTEGER,
+        contest_rating REAL,
+        synced_at REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS submission_calendar (
+        username TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        submissions INTEGER NOT NULL,
+        PRIMARY KEY (username, day)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_submission_calendar_day ON submission_calendar (day)",
+    """
+    CREATE TABLE IF NOT EXISTS ac_submissions (
+        username TEXT NOT NULL,
+        submission_id TEXT NOT NULL,
+        title_slug TEXT NOT NULL,
+        title TEXT,
+        timestamp INTEGER NOT NULL,
+        PRIMARY KEY (username, submission_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_ac_submissions_username_timestamp ON ac_submissions (username, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_ac_submissions_title_slug ON ac_submissions (title_slug)",
+    """
+    CREATE TABLE IF NOT EXISTS contest_history (
+        username TEXT NOT NULL,
+        start_time INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        rating REAL,
+        ranking INTEGER,
+        PRIMARY KEY (username, start_time)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS problems (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title_slug TEXT UNIQUE NOT NULL,
+        frontend_id TEXT,
+        title TEXT,
+        difficulty TEXT,
+        topics TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+]
+
+# One-off data fixes, applied once per database in order and recorded in meta
+MIGRATIONS = [
+    # Snapshots taken before MemberProfile.solved counted every problem twice
+    ("snapshots_distinct_solved", "UPDATE snapshots SET total_solved = easy + medium + hard"),
+]
+
+# One connection per process, shared by every Streamlit session thread and
+# serialised by _lock. WAL lets the refresher, CLIs and other processes read
+# while a write is in progress.
+_conn = None
+_conn_key = None
+_lock = threading.RLock()
+
+def connect():
+    conn = sqlite3.connect(DB_PATH, timeout=10, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    with conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+        for name, statement in MIGRATIONS:
+            key = f"migration:{name}"
+            if not conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                conn.execute(statement)
+                conn.execute("INSERT INTO meta (key, value) VALUES (?, CURRENT_TIMESTAMP)", (key,))
+    return conn
+
+def get_connection():
+    # Reopened if DB_PATH changes or after a fork
+    global _conn, _conn_key
+    key = (DB_PATH, os.getpid())
+    with _lock:
+        if _conn is None or _conn_key != key:
+            _conn = connect()
+            _conn_key = key
+        return _conn
+
+@contextmanager
+def transaction():
+    # Commits on success, rolls back on error
+    with _lock:
+        conn = get_connection()
+        with conn:
+            yield conn
+
+def close():
+    global _conn, _conn_key
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+        _conn = None
+        _conn_key = None
+
+# --- Users ---
+
+def get_password_hash(username):
+    with transaction() as conn:
+        row = conn.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+    return row[0] if row else None
+
+def create_user(username, password_hash):
+    # False if the username is taken; the UNIQUE constraint makes this race-free.
+    # A row with no password (a team owner created by _team_id) is claimed.
+    with transaction() as conn:
+        before = conn.total_changes
+        conn.execute(
+            "INSERT INTO users (username, password_hash) VALUES (?, ?) "
+            "ON CONFLICT (username) DO UPDATE SET password_hash = excluded.password_hash "
+            "WHERE users.password_hash = ''",
+            (username, password_hash),
+        )
+        return conn.total_changes > before
+
+def set_password_hash(username, password_hash):
+    with transaction() as conn:
+        conn.execute("UPDATE users SET password_hash = ? WHERE username = ?", (password_hash, username))
+
+# --- Teams and members ---
+
+def _team_id(conn, owner, create=False):
+    row = conn.execute(
+        "SELECT teams.id FROM teams JOIN users ON users.id = teams.owner_id "
+        "WHERE users.username = ? ORDER BY teams.id LIMIT 1",
+        (owner,),
+    ).fetchone()
+    if row or not create:
+        return row[0] if row else None
+    user = conn.execute("SELECT id FROM users WHERE username = ?", (owner,)).fetchone()
+    if user is None:
+        # Owners imported from members.json without a login still need a row
+        user_id = conn.execute(
+            "INSERT INTO users (username, password_hash) VALUES (?, '')", (owner,)
+        ).lastrowid
+    else:
+        user_id = user[0]
+    return conn.execute(
+        "INSERT INTO teams (name, owner_id) VALUES (?, ?)", (f"{owner}'s Team", user_id)
+    ).lastrowid
+
+def get_members(owner):
+    with transaction() as conn:
+        rows = conn.execute(
+            "SELECT members.name, members.leetcode_username FROM members "
+            "JOIN teams ON teams.id = members.team_id "
+            "JOIN users ON users.id = teams.owner_id "
+            "WHERE users.username = ? ORDER BY members.id",
+            (owner,),
+        ).fetchall()
+    return [{"name": name, "username": username} for name, username in rows]
+
+def get_all_members():
+    with transaction() as conn:
+        rows = conn.execute(
+            "SELECT users.username, members.name, members.leetcode_username FROM members "
+            "JOIN teams ON teams.id = members.team_id "
+            "JOIN users ON users.id = teams.owner_id "
+            "ORDER BY users.username, members.id"
+        ).fetchall()
+    all_members = {}
+    for owner, name, username in rows:
+        all_members.setdefault(owner, []).append({"name": name, "username": username})
+    return all_members
+
+def add_member(owner, name, username):
+    # False if the member is already on the team
+    try:
+        with transaction() as conn:
+            team_id = _team_id(conn, owner, create=True)
+            conn.execute(
+                "INSERT INTO members (team_id, name, leetcode_username) VALUES (?, ?, ?)",
+                (team_id, name, username),
+            )
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+def add_members(owner, members):
+    # One transaction for the whole batch; returns the usernames inserted
+    added = []
+    with transaction() as conn:
+        team_id = _team_id(conn, owner, create=True)
+        for member in members:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO members (team_id, name, leetcode_username) VALUES (?, ?, ?)",
+                (team_id, member.get("name", member["username"]), member["username"]),
+            )
+            if cursor.rowcount:
+                added.append(member["username"])
+    return added
+
+def remove_member(owner, username):
+    with transaction() as conn:
+        team_id = _team_id(conn, owner)
+        if team_id is None:
+            return False
+        cursor = conn.execute(
+            "DELETE FROM members WHERE team_id = ? AND leetcode_username = ?", (team_id, username)
+        )
+    return cursor.rowcount > 0
+
+def replace_members(owner, members):
+    with transaction() as conn:
+        team_id = _team_id(conn, owner, create=True)
+        conn.execute("DELETE FROM members WHERE team_id = ?", (team_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO members (team_id, name, leetcode_username) VALUES (?, ?, ?)",
+            [(team_id, m.get("name", m["username"]), m["username"]) for m in members],
+        )
+
+# --- One-shot import from the JSON files ---
+
+def import_json(members_path, users_path):
+    # Imports users.json and members.json once; later calls are no-ops.
+    # Returns (users_imported, members_imported).
+    with transaction() as conn:
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+            return 0, 0
+        users = {}
+        if os.path.exists(users_path):
+            with open(users_path, "r") as f:
+                users = json.load(f)
+        all_members = {}
+        if os.path.exists(members_path):
+            with open(members_path, "r") as f:
+                all_members = json.load(f)
+        users_imported = conn.executemany(
+            "INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?)",
+            list(users.items()),
+        ).rowcount
+        members_imported = 0
+        for owner, members in all_members.items():
+            team_id = _team_id(conn, owner, create=True)
+            members_imported += conn.executemany(
+                "INSERT OR IGNORE INTO members (team_id, name, leetcode_username) VALUES (?, ?, ?)",
+                [(team_id, m.get("name", m["username"]), m["username"]) for m in members],
+            ).rowcount
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', CURRENT_TIMESTAMP)")
+    return users_imported, members_imported
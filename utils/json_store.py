@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+# Crash- and concurrency-safe JSON files for the "json" storage backend.
+# Writes go to a temp file that is fsynced and atomically renamed over the
+# target; read-modify-write cycles hold an advisory lock on "<path>.lock" so
+# overlapping sessions and processes cannot lose each other's updates. Parsed
+# files are cached in memory and revalidated against the file's stat, so
+# load() hands out shared objects that callers must treat as read-only.
+
+_cache = {}
+_cache_lock = threading.Lock()
+_thread_locks = {}
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # A rename always produces a new inode, so same-second writes are caught
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _parse(path):
+    key = _stat_key(path)
+    if key is None:
+        return {}, None
+    with open(path, "r") as f:
+        return json.load(f), key
+
+def load(path):
+    # Parsing is skipped while the file is unchanged
+    key = _stat_key(path)
+    if key is None:
+        return {}
+    with _cache_lock:
+        cached = _cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    data, key = _parse(path)
+    with _cache_lock:
+        _cache[path] = (key, data)
+    return data
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Persist the rename itself
+        dir_fd = os.open(directory, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    with _cache_lock:
+        _cache[path] = (_stat_key(path), data)
+
+@contextmanager
+def locked(path):
+    with _cache_lock:
+        thread_lock = _thread_locks.setdefault(os.path.abspath(path), threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def update(path, fn):
+    # Locked read-modify-write: fn mutates the loaded data in place and its
+    # return value is passed through. Returning False skips the write.
+    with locked(path):
+        # Always a fresh parse: the data is mutated and must not be shared
+        data, _key = _parse(path)
+        result = fn(data)
+        if result is not False:
+            _write_atomic(path, data)
+        return result
+
+def save(path, data):
+    with locked(path):
+        _write_atomic(path, data)
@@ -0,0 +1,54 @@
+# Streamlit-free ranking of fetched profiles. build_leaderboard() returns a
+# precomputed view that the app renders directly. It is recomputed on every
+# run: ranking even a few thousand members takes about a millisecond, and
+# each row carries the whole profile, so a cached board would need every
+# field in its key to avoid serving stale ranks or avatars.
+
+def compute_leaderboard(profiles):
+    # Sorted by totalSolved (desc), ties broken by name. Ranks use standard
+    # competition ranking: equal totals share a rank and the next rank skips.
+    ordered = sorted(profiles, key=lambda p: (-p["totalSolved"], str(p.get("name", p["username"])).lower()))
+    max_solved = ordered[0]["totalSolved"] if ordered else 0
+    rows = []
+    rank = 0
+    previous = None
+    for position, profile in enumerate(ordered, start=1):
+        if profile["totalSolved"] != previous:
+            rank = position
+            previous = profile["totalSolved"]
+        row = dict(profile)
+        row["rank"] = rank
+        row["progress"] = profile["totalSolved"] / max_solved if max_solved > 0 else 0
+        rows.append(row)
+    weekly = sorted(
+        (row for row in rows if row.get("solvedThisWeek", 0) > 0),
+        key=lambda row: -row["solvedThisWeek"],
+    )
+    return {
+        "rows": rows,
+        "index": {row["username"]: row for row in rows},
+        "max_solved": max_solved,
+        "weekly": weekly,
+    }
+
+def build_leaderboard(profiles):
+    # The view the app renders; see compute_leaderboard
+    return compute_leaderboard(profiles)
+
+def filter_rows(rows, query="", active_only=False):
+    # Case-insensitive match on display name or LeetCode username
+    query = query.strip().lower()
+    if not query and not active_only:
+        return rows
+    return [
+        row for row in rows
+        if (not active_only or row.get("activeThisWeek", row.get("solvedThisWeek", 0) > 0))
+        and (not query or query in str(row.get("name", "")).lower() or query in row["username"].lower())
+    ]
+
+def paginate(rows, page, page_size):
+    # Returns (page_rows, page, page_count) with page clamped to a valid range
+    page_count = max(1, -(-len(rows) // page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return rows[start:start + page_size], page, page_count
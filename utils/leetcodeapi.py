@@ -1,10 +1,130 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
 
-def fetch_user_data(username):
-    url = "https://leetcode.com/graphql"
-    query = """
-    query getUserProfile($username: String!) {
-      matchedUser(username: $username) {
+from utils import metrics
+from utils.profile import MemberProfile
+from utils.ratelimit import RequestScheduler, TokenBucket
+
+API_URL = "https://leetcode.com/graphql"
+
+# Shared HTTP client: pooled keep-alive connections, bounded timeouts and
+# exponential backoff with full jitter on 429/5xx and connection failures.
+POOL_SIZE = 16
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Global budget shared by every session in the process (requests/second)
+RATE_LIMIT = 5
+RATE_LIMIT_BURST = 10
+
+# Upper bound on simultaneous requests when fetching a whole team
+MAX_WORKERS = 8
+
+# Upper bound on usernames per aliased batch query
+BATCH_CHUNK_SIZE = 20
+
+rate_limiter = TokenBucket(RATE_LIMIT, RATE_LIMIT_BURST)
+scheduler = RequestScheduler(MAX_WORKERS)
+
+_session = None
+_session_lock = threading.Lock()
+_http_stats = {
+    "requests": 0, "retries": 0, "throttled": 0, "server_errors": 0,
+    "timeouts": 0, "connection_errors": 0, "failures": 0,
+}
+_http_stats_lock = threading.Lock()
+
+def _count(key):
+    with _http_stats_lock:
+        _http_stats[key] += 1
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, pool_block=True)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def reset_session():
+    # Drop pooled connections, e.g. after changing POOL_SIZE or API_URL
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+def _retry_delay(attempt, response=None):
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX)
+            except ValueError:
+                pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+@metrics.instrument("leetcode_api")
+def post_graphql(payload):
+    # POST to API_URL through the shared session. Returns the last response
+    # once retries are exhausted; re-raises the last connection error.
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        rate_limiter.acquire()
+        _count("requests")
+        try:
+            response = session.post(API_URL, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            _count("timeouts" if isinstance(e, requests.Timeout) else "connection_errors")
+            if attempt == MAX_RETRIES:
+                _count("failures")
+                raise
+            _count("retries")
+            time.sleep(_retry_delay(attempt))
+            continue
+        metrics.count("leetcode_api_calls")
+        metrics.count("leetcode_api_bytes", len(response.content))
+        if response.status_code not in RETRY_STATUSES:
+            return response
+        _count("throttled" if response.status_code == 429 else "server_errors")
+        if attempt == MAX_RETRIES:
+            _count("failures")
+            return response
+        _count("retries")
+        time.sleep(_retry_delay(attempt, response))
+
+def http_stats():
+    # Request/retry counters plus connection reuse from the urllib3 pools
+    with _http_stats_lock:
+        stats = dict(_http_stats)
+    connections = pooled_requests = 0
+    with _session_lock:
+        session = _session
+    if session is not None:
+        for adapter in set(session.adapters.values()):
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    pooled_requests += pool.num_requests
+    stats["connections_opened"] = connections
+    stats["connection_reuse"] = 1 - connections / pooled_requests if pooled_requests else None
+    return stats
+
+USER_FIELDS = """
         username
         profile {
           realName
@@ -18,29 +138,274 @@ def fetch_user_data(username):
             submissions
           }
         }
-      }
+"""
+
+def parse_user(data):
+    # Turn a matchedUser payload into the dashboard's MemberProfile
+    return MemberProfile.from_payload(data)
+
+def fetch_user_data(username):
+    query = """
+    query getUserProfile($username: String!) {
+      matchedUser(username: $username) {%s      }
     }
-    """
-    response = requests.post(url, json={"query": query, "variables": {"username": username}})
+    """ % USER_FIELDS
+    response = post_graphql({"query": query, "variables": {"username": username}})
     if response.status_code == 200:
         data = response.json()["data"]["matchedUser"]
-        profile = data["profile"]
-        submissions = data["submitStatsGlobal"]["acSubmissionNum"]
-        total_solved = sum([s["count"] for s in submissions])
-        total_attempted = sum([s.get("submissions", 0) for s in submissions])
-
-        # Calculate acceptance rate
-        acceptance_rate = (total_solved / total_attempted) * 100 if total_attempted > 0 else None
-
-        return {
-            "username": data["username"],
-            "realName": profile.get("realName", ""),
-            "avatar": profile["userAvatar"],
-            "ranking": profile.get("ranking", ""),
-            "totalSolved": total_solved,
-            "totalAttempted": total_attempted,
-            "submissions": submissions,
-            "acceptanceRate": round(acceptance_rate, 2) if acceptance_rate is not None else None
-        }
+        if data is None:
+            return None
+        return parse_user(data)
     else:
         return None
+
+def build_batch_query(usernames):
+    # One matchedUser per username, aliased u0..uN so results map back by index
+    params = ", ".join(f"$u{i}: String!" for i in range(len(usernames)))
+    fields = "\n".join(
+        f"      u{i}: matchedUser(username: $u{i}) {{{USER_FIELDS}      }}"
+        for i in range(len(usernames))
+    )
+    query = f"query getUserProfiles({params}) {{\n{fields}\n    }}"
+    variables = {f"u{i}": name for i, name in enumerate(usernames)}
+    return query, variables
+
+def fetch_users_chunk(usernames):
+    # Returns {username: profile or None}; a null alias (renamed or deleted
+    # user) only affects that username, not the rest of the chunk.
+    query, variables = build_batch_query(usernames)
+    response = post_graphql({"query": query, "variables": variables})
+    results = dict.fromkeys(usernames)
+    if response.status_code != 200:
+        return results
+    data = response.json().get("data") or {}
+    for i, username in enumerate(usernames):
+        user = data.get(f"u{i}")
+        if user:
+            results[username] = parse_user(user)
+    return results
+
+def fetch_users_data(usernames, chunk_size=BATCH_CHUNK_SIZE, max_workers=MAX_WORKERS):
+    # Batched variant of fetch_user_data: one request per chunk of usernames,
+    # chunks fetched in parallel. Missing users and failed chunks map to None.
+    usernames = list(dict.fromkeys(usernames))
+    chunks = [usernames[i:i + chunk_size] for i in range(0, len(usernames), chunk_size)]
+    results = dict.fromkeys(usernames)
+    for _index, _chunk, data, _error in iter_users_data(chunks, max_workers, fetch_users_chunk):
+        if data:
+            results.update(data)
+    return results
+
+def iter_users_data(usernames, max_workers=MAX_WORKERS, fetch=fetch_user_data):
+    # Yields (index, username, data, error) in completion order so callers can
+    # render partial results; one failing member never aborts the batch.
+    usernames = list(usernames)
+    if not usernames:
+        return
+    workers = max(1, min(max_workers, len(usernames)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, name): (i, name) for i, name in enumerate(usernames)}
+        for future in as_completed(futures):
+            index, username = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                yield index, username, None, e
+                continue
+            if data is None:
+                yield index, username, None, LookupError(f"no LeetCode data for '{username}'")
+            else:
+                yield index, username, data, None
+
+def fetch_users_concurrently(usernames, max_workers=MAX_WORKERS, fetch=fetch_user_data):
+    # Returns (results, errors): results keeps the input order with None for
+    # failed members, errors maps username -> exception.
+    usernames = list(usernames)
+    results = [None] * len(usernames)
+    errors = {}
+    for index, username, data, error in iter_users_data(usernames, max_workers, fetch):
+        if error is None:
+            results[index] = data
+        else:
+            errors[username] = error
+    return results, errors
+
+def schedule_users_futures(usernames, team=None, chunk_size=BATCH_CHUNK_SIZE):
+    # {username: Future} for a profile fetch on the process-wide scheduler;
+    # each future resolves to a profile or None
+    return scheduler.fetch_many(usernames, fetch_users_chunk, chunk_size, team=team)
+
+def schedule_users_data(usernames, team=None, chunk_size=BATCH_CHUNK_SIZE):
+    # Like fetch_users_data, but queued on the process-wide scheduler: fair
+    # across teams, rate limited, and shared with concurrent sessions that
+    # are already fetching the same usernames.
+    futures = schedule_users_futures(usernames, team, chunk_size)
+    results = {}
+    for username, future in futures.items():
+        try:
+            results[username] = future.result()
+        except Exception:
+            results[username] = None
+    return results
+
+# Recent accepted submissions requested per member; LeetCode caps the list at 20
+RECENT_AC_LIMIT = 20
+
+ACTIVITY_FIELDS = """
+      c{i}: matchedUser(username: $u{i}) {{
+        userCalendar {{
+          submissionCalendar
+        }}
+      }}
+      r{i}: recentAcSubmissionList(username: $u{i}, limit: $limit) {{
+        id
+        title
+        titleSlug
+        timestamp
+      }}
+      k{i}: userContestRanking(username: $u{i}) {{
+        attendedContestsCount
+        rating
+      }}"""
+
+CONTEST_HISTORY_FIELDS = """
+      h{i}: userContestRankingHistory(username: $u{i}) {{
+        attended
+        rating
+        ranking
+        contest {{
+          title
+          startTime
+        }}
+      }}"""
+
+def build_aliased_query(operation, fields, usernames, extra_params=""):
+    # fields is a template with {i} placeholders; usernames bind to $u0..$uN
+    params = ", ".join([f"$u{i}: String!" for i in range(len(usernames))] + ([extra_params] if extra_params else []))
+    body = "".join(fields.format(i=i) for i in range(len(usernames)))
+    query = f"query {operation}({params}) {{{body}\n    }}"
+    variables = {f"u{i}": name for i, name in enumerate(usernames)}
+    return query, variables
+
+def parse_calendar(raw):
+    # submissionCalendar is a JSON string of {day_start_epoch: submissions}
+    if not raw:
+        return {}
+    return {int(day): int(count) for day, count in json.loads(raw).items()}
+
+def fetch_activity_chunk(usernames, limit=RECENT_AC_LIMIT):
+    # Returns {username: {"calendar", "recent", "contest"} or None}
+    query, variables = build_aliased_query("getUserActivity", ACTIVITY_FIELDS, usernames, "$limit: Int!")
+    variables["limit"] = limit
+    response = post_graphql({"query": query, "variables": variables})
+    results = dict.fromkeys(usernames)
+    if response.status_code != 200:
+        return results
+    data = response.json().get("data") or {}
+    for i, username in enumerate(usernames):
+        user = data.get(f"c{i}")
+        if not user:
+            continue
+        calendar = (user.get("userCalendar") or {}).get("submissionCalendar")
+        results[username] = {
+            "calendar": parse_calendar(calendar),
+            "recent": [
+                {"id": str(s["id"]), "title": s["title"], "titleSlug": s["titleSlug"], "timestamp": int(s["timestamp"])}
+                for s in data.get(f"r{i}") or []
+            ],
+            "contest": data.get(f"k{i}"),
+        }
+    return results
+
+def fetch_contest_history_chunk(usernames):
+    # Returns {username: [attended contests] or None}
+    query, variables = build_aliased_query("getContestHistory", CONTEST_HISTORY_FIELDS, usernames)
+    response = post_graphql({"query": query, "variables": variables})
+    results = dict.fromkeys(usernames)
+    if response.status_code != 200:
+        return results
+    data = response.json().get("data") or {}
+    for i, username in enumerate(usernames):
+        history = data.get(f"h{i}")
+        if history is None:
+            continue
+        results[username] = [
+            {
+                "title": h["contest"]["title"],
+                "startTime": int(h["contest"]["startTime"]),
+                "rating": h.get("rating"),
+                "ranking": h.get("ranking"),
+            }
+            for h in history if h.get("attended")
+        ]
+    return results
+
+# Problem catalogue page size for problemsetQuestionList
+PROBLEM_PAGE_SIZE = 100
+
+def fetch_problem_page(skip, limit=PROBLEM_PAGE_SIZE):
+    # Returns (total, [problem]) or None on failure
+    query = """
+    query problemsetQuestionList($skip: Int, $limit: Int) {
+      problemsetQuestionList: questionList(categorySlug: "", limit: $limit, skip: $skip, filters: {}) {
+        total: totalNum
+        questions: data {
+          frontendQuestionId: questionFrontendId
+          title
+          titleSlug
+          difficulty
+          topicTags {
+            name
+          }
+        }
+      }
+    }
+    """
+    response = post_graphql({"query": query, "variables": {"skip": skip, "limit": limit}})
+    if response.status_code != 200:
+        return None
+    page = (response.json().get("data") or {}).get("problemsetQuestionList")
+    if page is None:
+        return None
+    return page["total"], page["questions"]
+
+def fetch_problem_catalog(page_size=PROBLEM_PAGE_SIZE):
+    # Every problem's id, title, slug, difficulty and topics, or None if any page failed
+    problems = []
+    total = None
+    while total is None or len(problems) < total:
+        page = fetch_problem_page(len(problems), page_size)
+        if page is None:
+            return None
+        total, questions = page
+        if not questions:
+            break
+        problems.extend(questions)
+    return problems
+
+def schedule_chunks(usernames, fetch_chunk, team=None, chunk_size=BATCH_CHUNK_SIZE):
+    # Queues fetch_chunk(chunk) -> {username: data} on the shared scheduler
+    # (fair and rate limited). No in-flight sharing: the scheduler's dedup
+    # table is keyed by username and belongs to profile fetches.
+    usernames = list(dict.fromkeys(usernames))
+    jobs = [
+        (chunk, scheduler.submit(fetch_chunk, chunk, team=team))
+        for chunk in (usernames[i:i + chunk_size] for i in range(0, len(usernames), chunk_size))
+    ]
+    results = dict.fromkeys(usernames)
+    for chunk, job in jobs:
+        try:
+            results.update(job.result() or {})
+        except Exception:
+            pass
+    return results
+
+def scheduler_stats():
+    stats = scheduler.stats()
+    stats.update(rate_limiter.stats())
+    with _http_stats_lock:
+        stats["throttled_responses"] = _http_stats["throttled"]
+    return stats
+
+metrics.register_collector("http", http_stats)
+metrics.register_collector("scheduler", scheduler_stats)
@@ -0,0 +1,150 @@
+import functools
+import os
+import threading
+import time
+
+# Lightweight timing and counters for the dashboard hot path. Disabled
+# unless DASHBOARD_METRICS=1: timed() then hands back a shared no-op context
+# manager and count() returns immediately, so instrumented code pays one
+# attribute lookup and a branch.
+
+ENABLED = os.environ.get("DASHBOARD_METRICS", "") == "1"
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_collectors = {}
+_local = threading.local()
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+def observe(name, seconds):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][i] += 1
+                break
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+def timed(name):
+    # with timed("stage"): ...
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(name)
+
+def instrument(name):
+    # Decorator form of timed()
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _Timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count(name, n=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def begin_run():
+    # Marks the start of a dashboard script run on this thread
+    if ENABLED:
+        _local.run_start = time.perf_counter()
+
+def end_run():
+    start = getattr(_local, "run_start", None)
+    if ENABLED and start is not None:
+        observe("dashboard_run", time.perf_counter() - start)
+        _local.run_start = None
+
+def register_collector(prefix, fn):
+    # fn() -> {name: number}; exported as gauges named <prefix>_<name>
+    _collectors[prefix] = fn
+
+def snapshot():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {
+            name: {"buckets": list(h["buckets"]), "sum": h["sum"], "count": h["count"]}
+            for name, h in _histograms.items()
+        }
+    gauges = {}
+    for prefix, fn in _collectors.items():
+        try:
+            values = fn()
+        except Exception:
+            continue
+        for name, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                gauges[f"{prefix}_{name}"] = value
+    return {"counters": counters, "histograms": histograms, "gauges": gauges}
+
+def quantile(histogram, q):
+    # Upper bucket bound containing the q-quantile, or None if empty
+    if not histogram["count"]:
+        return None
+    target = q * histogram["count"]
+    seen = 0
+    for bound, n in zip(BUCKETS, histogram["buckets"]):
+        seen += n
+        if seen >= target:
+            return bound
+    return BUCKETS[-1]
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+def prometheus_text(namespace="leetcode_dashboard"):
+    data = snapshot()
+    lines = []
+    for name, value in sorted(data["counters"].items()):
+        metric = f"{namespace}_{name}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    for name, value in sorted(data["gauges"].items()):
+        metric = f"{namespace}_{name}"
+        lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+    for name, histogram in sorted(data["histograms"].items()):
+        metric = f"{namespace}_{name}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, histogram["buckets"]):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{metric}_sum {histogram['sum']}")
+        lines.append(f"{metric}_count {histogram['count']}")
+    return "\n".join(lines) + "\n"
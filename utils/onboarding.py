@@ -0,0 +1,61 @@
+import csv
+
+from utils import storage
+from utils.cache import get_users_data
+
+# Bulk member onboarding: parse a pasted list or CSV of name/username pairs,
+# validate every username in one batched (and cached) lookup, then add all
+# valid members in a single write.
+
+def _delimiter(line):
+    # The first comma or tab outside double quotes, so mixed pastes work
+    quoted = False
+    for char in line:
+        if char == '"':
+            quoted = not quoted
+        elif char in ",\t" and not quoted:
+            return char
+    return ","
+
+def parse_members(text):
+    # Accepts "Name, username" or "username" per line, comma or tab separated
+    # (chosen per line), with an optional "name,username" header. Usernames
+    # containing whitespace are malformed. Returns (entries, malformed).
+    entries = []
+    malformed = []
+    for line in text.splitlines():
+        row = next(csv.reader([line], delimiter=_delimiter(line)), [])
+        cells = [c.strip() for c in row if c.strip()]
+        if not cells:
+            continue
+        if [c.lower() for c in cells[:2]] in (["name", "username"], ["username"]):
+            continue
+        username = cells[-1]
+        if len(cells) > 2 or any(c.isspace() for c in username):
+            malformed.append(line.strip())
+        else:
+            entries.append({"name": cells[0], "username": username})
+    return entries, malformed
+
+def onboard_members(user, entries, existing=()):
+    # Returns a summary dict of added / invalid / duplicate usernames. The
+    # profiles fetched for validation land in the cache, so the next render
+    # does not fetch them again.
+    existing = set(existing)
+    seen = set()
+    candidates = []
+    duplicates = []
+    for entry in entries:
+        username = entry["username"]
+        if username in existing or username in seen:
+            duplicates.append(username)
+        else:
+            seen.add(username)
+            candidates.append(entry)
+
+    profiles = get_users_data([e["username"] for e in candidates], team=user) if candidates else {}
+    valid = [e for e in candidates if profiles.get(e["username"])]
+    invalid = [e["username"] for e in candidates if not profiles.get(e["username"])]
+    added = storage.add_members(user, valid) if valid else []
+    duplicates.extend(e["username"] for e in valid if e["username"] not in added)
+    return {"added": added, "invalid": invalid, "duplicates": duplicates}
@@ -0,0 +1,109 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import cache, db
+from utils.profile import profiles_frame
+from utils.storage import load_all_members
+
+# Organisation-wide view across every team. Cached profiles are loaded into
+# one columnar DataFrame; per-team frames are rebuilt only when that team's
+# member list or cached profiles change, and every rollup is a vectorized
+# groupby over the combined frame.
+
+COLUMNS = ["team", "username", "name", "totalSolved", "easy", "medium", "hard", "ranking"]
+
+# Team keys are owners' login usernames, so only these logins (comma
+# separated) see other teams by name; everyone else gets anonymize()'d rollups
+ORG_ADMINS = {u.strip() for u in os.environ.get("DASHBOARD_ORG_ADMINS", "").split(",") if u.strip()}
+
+_team_frames = {}
+_team_frames_lock = threading.Lock()
+
+def team_frame(team, members, profiles):
+    # One row per member with a cached profile
+    present = [m for m in members if profiles.get(m["username"]) is not None]
+    frame = profiles_frame(
+        [profiles[m["username"]] for m in present],
+        {m["username"]: m.get("name", m["username"]) for m in present},
+    )
+    frame.insert(0, "team", team)
+    return frame[COLUMNS]
+
+def cache_versions():
+    # {username: last_updated}; cheap compared with decoding every profile
+    with db.transaction() as conn:
+        return dict(conn.execute("SELECT username, last_updated FROM leetcode_cache"))
+
+def load_org_frame():
+    all_members = load_all_members()
+    versions = cache_versions()
+    frames = []
+    with _team_frames_lock:
+        for team in list(_team_frames):
+            if team not in all_members:
+                del _team_frames[team]
+        for team, members in all_members.items():
+            fingerprint = tuple(
+                (m["username"], m.get("name"), versions.get(m["username"])) for m in members
+            )
+            cached = _team_frames.get(team)
+            if cached is None or cached[0] != fingerprint:
+                profiles = {u: d for u, (d, _age) in cache.read_cache(m["username"] for m in members).items()}
+                cached = (fingerprint, team_frame(team, members, profiles))
+                _team_frames[team] = cached
+            frames.append(cached[1])
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    frame = pd.concat(frames, ignore_index=True)
+    frame["team"] = frame["team"].astype("category")
+    return frame
+
+def org_rollups(frame):
+    # Returns (team_stats, members) where team_stats has one row per team and
+    # members gains org-wide rank and percentile columns.
+    members = frame.copy()
+    solved = members["totalSolved"]
+    members["orgRank"] = solved.rank(method="min", ascending=False).astype(int)
+    members["percentile"] = (solved.rank(method="max", pct=True) * 100).round(1)
+    members["teamRank"] = members.groupby("team", observed=True)["totalSolved"].rank(
+        method="min", ascending=False
+    ).astype(int)
+
+    grouped = members.groupby("team", observed=True)
+    stats = grouped.agg(
+        members=("username", "size"),
+        totalSolved=("totalSolved", "sum"),
+        mean=("totalSolved", "mean"),
+        median=("totalSolved", "median"),
+        easy=("easy", "sum"),
+        medium=("medium", "sum"),
+        hard=("hard", "sum"),
+    )
+    quantiles = grouped["totalSolved"].quantile([0.25, 0.75, 0.9]).unstack()
+    quantiles.columns = ["p25", "p75", "p90"]
+    stats = stats.join(quantiles)
+    difficulty_total = stats[["easy", "medium", "hard"]].sum(axis=1).replace(0, np.nan)
+    for column in ("easy", "medium", "hard"):
+        stats[f"{column}Share"] = (stats[column] / difficulty_total).fillna(0).round(3)
+    stats["rank"] = stats["totalSolved"].rank(method="min", ascending=False).astype(int)
+    stats = stats.sort_values(["rank", "median"], ascending=[True, False]).reset_index()
+    return stats, members.sort_values("orgRank")
+
+def anonymize(team_stats, members, own_team):
+    # Other teams become "Team <position>" in ranking order and their
+    # members lose names and usernames; own_team is left as-is
+    labels = {
+        team: team if team == own_team else f"Team {position}"
+        for position, team in enumerate(team_stats["team"], start=1)
+    }
+    team_stats = team_stats.copy()
+    team_stats["team"] = team_stats["team"].map(labels)
+    members = members.copy()
+    others = (members["team"] != own_team).to_numpy()
+    members["team"] = members["team"].astype(str).map(labels)
+    members["name"] = members["name"].where(~others, "Anonymous")
+    members["username"] = members["username"].where(~others, "")
+    return team_stats, members
@@ -0,0 +1,209 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils import db
+
+# Problem-level "who solved what" index. Every problem has a stable integer id
+# in the problems table (assigned by utils.catalog's sync, or on first sight of
+# a solved slug), and id - 1 is its bit position. A team's index is one packed
+# bit matrix (members x problems) plus packed bit rows per topic and
+# difficulty, so coverage, overlap and gap queries are numpy OR/AND/popcount
+# over a few hundred bytes per member. Solved problems come from the synced
+# accepted submissions in utils.activity, so coverage grows as members are
+# synced.
+
+CACHE_SIZE = 16
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+# {username: (synced_at, sorted problem ids)}
+_member_ids = {}
+_member_ids_lock = threading.Lock()
+
+def _packed(mask):
+    return np.packbits(mask, axis=-1)
+
+def _popcount(bits, axis=-1):
+    return np.unpackbits(bits, axis=axis).sum(axis=axis)
+
+def _version(conn, usernames):
+    # Changes whenever a member syncs or a problem is added
+    problem_count = conn.execute("SELECT COALESCE(MAX(id), 0) FROM problems").fetchone()[0]
+    synced = 0
+    for i in range(0, len(usernames), 500):
+        chunk = usernames[i:i + 500]
+        value = conn.execute(
+            f"SELECT MAX(synced_at) FROM activity_sync WHERE username IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchone()[0]
+        synced = max(synced, value or 0)
+    return problem_count, synced
+
+def _solved_ids(conn, usernames, slug_ids):
+    # {username: np.array of solved problem ids}. Reuses each member's ids
+    # until their next activity sync, so a rebuild after one member synced
+    # only reads that member's submissions.
+    synced = {}
+    for i in range(0, len(usernames), 500):
+        chunk = usernames[i:i + 500]
+        synced.update(conn.execute(
+            f"SELECT username, synced_at FROM activity_sync WHERE username IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchall())
+    with _member_ids_lock:
+        cached = {u: _member_ids.get(u) for u in usernames}
+    stale = [u for u in usernames if cached[u] is None or cached[u][0] != synced.get(u)]
+    fresh = {u: [] for u in stale}
+    for i in range(0, len(stale), 500):
+        chunk = stale[i:i + 500]
+        for username, slug in conn.execute(
+            f"SELECT username, title_slug FROM ac_submissions WHERE username IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ):
+            pid = slug_ids.get(slug)
+            if pid is not None:
+                fresh[username].append(pid)
+    with _member_ids_lock:
+        for username, ids in fresh.items():
+            cached[username] = _member_ids[username] = (synced.get(username), np.unique(np.array(ids, dtype=np.int64)))
+    return {u: cached[u][1] for u in usernames}
+
+def compute_index(usernames):
+    # {"usernames", "row", "size", "problems", "solved", "known", "topics",
+    # "difficulties"}; bit rows are np.uint8 arrays of ceil(size / 8) bytes
+    usernames = list(dict.fromkeys(usernames))
+    with db.transaction() as conn:
+        problems = conn.execute(
+            "SELECT id, title_slug, frontend_id, title, difficulty, topics FROM problems ORDER BY id"
+        ).fetchall()
+        size = problems[-1][0] if problems else 0
+        member_ids = _solved_ids(conn, usernames, {p[1]: p[0] for p in problems})
+    row = {username: i for i, username in enumerate(usernames)}
+    solved = np.zeros((len(usernames), size), dtype=bool)
+    if usernames:
+        counts = [len(member_ids[u]) for u in usernames]
+        rows = np.repeat(np.arange(len(usernames)), counts)
+        solved[rows, np.concatenate([member_ids[u] for u in usernames]) - 1] = True
+
+    # id - 1 -> (slug, frontend id, title, difficulty, topics). Ids with no
+    # row stay None; slugs not yet in the catalogue have no topic or difficulty.
+    table = [None] * size
+    known = np.zeros(size, dtype=bool)
+    topic_masks = {}
+    difficulty_masks = {}
+    for pid, slug, frontend_id, title, difficulty, topics in problems:
+        known[pid - 1] = True
+        topic_list = [t for t in (topics or "").split(",") if t]
+        table[pid - 1] = (slug, frontend_id, title or slug, difficulty, topic_list)
+        for topic in topic_list:
+            topic_masks.setdefault(topic, np.zeros(size, dtype=bool))[pid - 1] = True
+        if difficulty:
+            difficulty_masks.setdefault(difficulty, np.zeros(size, dtype=bool))[pid - 1] = True
+    return {
+        "usernames": usernames,
+        "row": row,
+        "size": size,
+        "problems": table,
+        "solved": _packed(solved),
+        "known": _packed(known),
+        "topics": {t: _packed(m) for t, m in sorted(topic_masks.items())},
+        "difficulties": {d: _packed(m) for d, m in difficulty_masks.items()},
+    }
+
+def build_index(usernames):
+    # Cached compute_index per member list and data version; do not mutate
+    usernames = tuple(dict.fromkeys(usernames))
+    with db.transaction() as conn:
+        key = (usernames, _version(conn, list(usernames)))
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = compute_index(usernames)
+    with _cache_lock:
+        _cache[key] = index
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+def _rows(index, usernames=None):
+    if usernames is None:
+        return index["solved"]
+    return index["solved"][[index["row"][u] for u in usernames if u in index["row"]]]
+
+def team_solved(index, usernames=None):
+    # Packed union of everything the given members (default: all) solved
+    rows = _rows(index, usernames)
+    if not len(rows):
+        return np.zeros(index["solved"].shape[1], dtype=np.uint8)
+    return np.bitwise_or.reduce(rows, axis=0)
+
+def solver_counts(index, usernames=None):
+    # Members who solved each problem, as an int array indexed by id - 1
+    rows = _rows(index, usernames)
+    if not len(rows):
+        return np.zeros(index["size"], dtype=np.int64)
+    return np.unpackbits(rows, axis=1, count=index["size"]).sum(axis=0, dtype=np.int64)
+
+def coverage(index, usernames=None):
+    # (solved by the team, known problems)
+    return int(_popcount(team_solved(index, usernames))), int(_popcount(index["known"]))
+
+def coverage_by_topic(index, usernames=None):
+    # [(topic, solved by the team, problems in topic)], weakest coverage first
+    if not index["topics"]:
+        return []
+    topics = list(index["topics"])
+    masks = np.stack([index["topics"][t] for t in topics])
+    covered = _popcount(masks & team_solved(index, usernames), axis=1)
+    totals = _popcount(masks, axis=1)
+    rows = [(t, int(c), int(n)) for t, c, n in zip(topics, covered, totals)]
+    return sorted(rows, key=lambda r: (r[1] / r[2] if r[2] else 1, r[0]))
+
+def overlap(index, a, b):
+    # {"both", "only_a", "only_b"} problem counts for two members
+    bits_a = index["solved"][index["row"][a]]
+    bits_b = index["solved"][index["row"][b]]
+    return {
+        "both": int(_popcount(bits_a & bits_b)),
+        "only_a": int(_popcount(bits_a & ~bits_b)),
+        "only_b": int(_popcount(~bits_a & bits_b)),
+    }
+
+def _mask(index, topic=None, difficulty=None):
+    mask = index["known"]
+    if topic is not None:
+        mask = mask & index["topics"].get(topic, np.zeros_like(mask))
+    if difficulty is not None:
+        mask = mask & index["difficulties"].get(difficulty, np.zeros_like(mask))
+    return mask
+
+def _problem_ids(bits, size, limit=None):
+    ids = np.flatnonzero(np.unpackbits(bits, count=size)) + 1
+    return ids if limit is None else ids[:limit]
+
+def gaps(index, usernames=None, topic=None, difficulty=None, limit=None):
+    # Problem ids nobody among usernames has solved, lowest id first
+    bits = _mask(index, topic, difficulty) & ~team_solved(index, usernames)
+    return [int(pid) for pid in _problem_ids(bits, index["size"], limit)]
+
+def recommend(index, username, topic=None, difficulty=None, limit=10):
+    # [(problem id, teammates who solved it)] the member has not solved yet.
+    # Problems popular with teammates come first, then untouched ones.
+    unsolved = _mask(index, topic, difficulty)
+    if username in index["row"]:
+        unsolved = unsolved & ~index["solved"][index["row"][username]]
+    candidates = np.flatnonzero(np.unpackbits(unsolved, count=index["size"]))
+    if not len(candidates):
+        return []
+    teammates = [u for u in index["usernames"] if u != username]
+    counts = solver_counts(index, teammates)[candidates]
+    order = np.lexsort((candidates, -counts))[:limit]
+    return [(int(candidates[i]) + 1, int(counts[i])) for i in order]
+
+def describe(index, problem_id):
+    # (slug, frontend id, title, difficulty, topics) for a problem id
+    return index["problems"][problem_id - 1]
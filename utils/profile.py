@@ -0,0 +1,191 @@
+import json
+import struct
+
+# Typed, compact member profile. Everything the dashboard reads from a
+# LeetCode matchedUser payload lives in fixed slots (per-difficulty counts
+# instead of a list of dicts), and pack()/unpack() give a struct-packed
+# binary form for the SQLite cache: roughly a quarter of the JSON size and
+# no dict allocation when decoding.
+
+FORMAT_VERSION = 1
+# version, ranking (-1 = unknown), solved counts All/Easy/Medium/Hard,
+# submission counts All/Easy/Medium/Hard, then byte lengths of the
+# username, real name and avatar URL that follow the header as UTF-8
+_HEADER = struct.Struct("<Bq8I3H")
+
+DIFFICULTIES = ("All", "Easy", "Medium", "Hard")
+
+def _ranking(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+class MemberProfile:
+    __slots__ = (
+        "username", "real_name", "avatar", "ranking",
+        "all_solved", "easy", "medium", "hard",
+        "all_submissions", "easy_submissions", "medium_submissions", "hard_submissions",
+    )
+
+    def __init__(self, username, real_name="", avatar="", ranking=None,
+                 all_solved=0, easy=0, medium=0, hard=0,
+                 all_submissions=0, easy_submissions=0, medium_submissions=0, hard_submissions=0):
+        self.username = username
+        self.real_name = real_name or ""
+        self.avatar = avatar or ""
+        self.ranking = _ranking(ranking)
+        self.all_solved = all_solved
+        self.easy = easy
+        self.medium = medium
+        self.hard = hard
+        self.all_submissions = all_submissions
+        self.easy_submissions = easy_submissions
+        self.medium_submissions = medium_submissions
+        self.hard_submissions = hard_submissions
+
+    @classmethod
+    def from_submissions(cls, username, real_name, avatar, ranking, submissions):
+        # submissions: acSubmissionNum rows [{difficulty, count, submissions}]
+        counts = {s["difficulty"]: (s.get("count", 0), s.get("submissions", 0)) for s in submissions}
+        (all_solved, all_subs), (easy, easy_subs), (medium, medium_subs), (hard, hard_subs) = (
+            counts.get(d, (0, 0)) for d in DIFFICULTIES
+        )
+        return cls(username, real_name, avatar, ranking, all_solved, easy, medium, hard,
+                   all_subs, easy_subs, medium_subs, hard_subs)
+
+    @classmethod
+    def from_payload(cls, data):
+        # A matchedUser payload from the GraphQL API
+        profile = data["profile"]
+        return cls.from_submissions(
+            data["username"], profile.get("realName", ""), profile["userAvatar"],
+            profile.get("ranking"), data["submitStatsGlobal"]["acSubmissionNum"],
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        # The JSON dict shape cached and exported before MemberProfile existed
+        return cls.from_submissions(
+            data["username"], data.get("realName", ""), data.get("avatar", ""),
+            data.get("ranking"), data.get("submissions", []),
+        )
+
+    # totalSolved has always been the sum over every acSubmissionNum row,
+    # the "All" row included, so it counts each problem twice; kept as the
+    # leaderboard's figure so rankings stay comparable across versions.
+    @property
+    def total_solved(self):
+        return self.all_solved + self.easy + self.medium + self.hard
+
+    # Distinct problems solved; what snapshots and org rollups count
+    @property
+    def solved(self):
+        return self.easy + self.medium + self.hard
+
+    @property
+    def total_attempted(self):
+        return self.all_submissions + self.easy_submissions + self.medium_submissions + self.hard_submissions
+
+    @property
+    def acceptance_rate(self):
+        attempted = self.total_attempted
+        return round(self.total_solved / attempted * 100, 2) if attempted > 0 else None
+
+    def submissions(self):
+        # acSubmissionNum-shaped rows, for export and the JSON dict form
+        return [
+            {"difficulty": d, "count": count, "submissions": subs}
+            for d, count, subs in zip(
+                DIFFICULTIES,
+                (self.all_solved, self.easy, self.medium, self.hard),
+                (self.all_submissions, self.easy_submissions, self.medium_submissions, self.hard_submissions),
+            )
+        ]
+
+    def to_dict(self):
+        return {
+            "username": self.username,
+            "realName": self.real_name,
+            "avatar": self.avatar,
+            "ranking": self.ranking,
+            "totalSolved": self.total_solved,
+            "totalAttempted": self.total_attempted,
+            "submissions": self.submissions(),
+            "acceptanceRate": self.acceptance_rate,
+        }
+
+    def to_row(self, name=None):
+        # Flat dict for one leaderboard/profile row; a fresh dict per call
+        return {
+            "username": self.username,
+            "name": name or self.username,
+            "realName": self.real_name,
+            "avatar": self.avatar,
+            "ranking": self.ranking,
+            "totalSolved": self.total_solved,
+            "totalAttempted": self.total_attempted,
+            "acceptanceRate": self.acceptance_rate,
+            "easy": self.easy,
+            "medium": self.medium,
+            "hard": self.hard,
+        }
+
+    def pack(self):
+        username, real_name, avatar = (s.encode("utf-8") for s in (self.username, self.real_name, self.avatar))
+        return _HEADER.pack(
+            FORMAT_VERSION, -1 if self.ranking is None else self.ranking,
+            self.all_solved, self.easy, self.medium, self.hard,
+            self.all_submissions, self.easy_submissions, self.medium_submissions, self.hard_submissions,
+            len(username), len(real_name), len(avatar),
+        ) + username + real_name + avatar
+
+    @classmethod
+    def unpack(cls, raw):
+        fields = _HEADER.unpack_from(raw)
+        if fields[0] != FORMAT_VERSION:
+            raise ValueError(f"unknown profile format {fields[0]}")
+        ranking = None if fields[1] < 0 else fields[1]
+        offset = _HEADER.size
+        strings = []
+        for length in fields[10:13]:
+            strings.append(bytes(raw[offset:offset + length]).decode("utf-8"))
+            offset += length
+        return cls(strings[0], strings[1], strings[2], ranking, *fields[2:10])
+
+    def __eq__(self, other):
+        if not isinstance(other, MemberProfile):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return f"MemberProfile({self.username!r}, total_solved={self.total_solved})"
+
+def decode(data):
+    # Cache column value -> MemberProfile; accepts packed bytes or legacy JSON
+    if isinstance(data, (bytes, memoryview)):
+        return MemberProfile.unpack(data)
+    return MemberProfile.from_dict(json.loads(data))
+
+FRAME_COLUMNS = ["username", "name", "totalSolved", "easy", "medium", "hard", "ranking", "totalAttempted"]
+
+def profiles_frame(profiles, names=None):
+    # One-pass DataFrame from MemberProfiles: columns are filled straight
+    # from the slots, with no per-row dicts. names: {username: display name}.
+    # totalSolved here is distinct problems (MemberProfile.solved).
+    import pandas as pd
+
+    names = names or {}
+    columns = {c: [] for c in FRAME_COLUMNS}
+    for p in profiles:
+        columns["username"].append(p.username)
+        columns["name"].append(names.get(p.username, p.username))
+        columns["totalSolved"].append(p.solved)
+        columns["easy"].append(p.easy)
+        columns["medium"].append(p.medium)
+        columns["hard"].append(p.hard)
+        columns["ranking"].append(p.ranking)
+        columns["totalAttempted"].append(p.total_attempted)
+    frame = pd.DataFrame(columns, columns=FRAME_COLUMNS)
+    frame["ranking"] = frame["ranking"].astype("float64")
+    return frame
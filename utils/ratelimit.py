@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# Process-wide request scheduling for the LeetCode API. A token bucket caps
+# the global request rate; a round-robin queue per team keeps one large team
+# from starving the others; usernames already being fetched by another
+# session are shared instead of requested twice.
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.lock = threading.Lock()
+        self.set_rate(rate, burst)
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def set_rate(self, rate, burst):
+        # rate is tokens per second; None disables limiting
+        with self.lock:
+            self.rate = rate
+            self.burst = max(1, burst)
+            self.tokens = float(self.burst)
+            self.updated = time.monotonic()
+
+    def acquire(self):
+        # Block until a token is available; returns the time spent waiting
+        waited = 0.0
+        while True:
+            with self.lock:
+                if self.rate is None:
+                    return waited
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    if waited:
+                        self.waits += 1
+                        self.wait_time += waited
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def stats(self):
+        with self.lock:
+            return {"throttle_waits": self.waits, "throttle_wait_time": self.wait_time}
+
+class RequestScheduler:
+    def __init__(self, workers):
+        self.lock = threading.Condition()
+        self.queues = {}
+        self.order = deque()
+        self.inflight = {}
+        self.workers = workers
+        self.threads = []
+        self.submitted = 0
+        self.deduplicated = 0
+        self.queue_wait_time = 0.0
+        self.max_queue_wait = 0.0
+
+    def _ensure_workers(self):
+        # Called with the lock held; threads are started lazily
+        self.threads = [t for t in self.threads if t.is_alive()]
+        for _ in range(self.workers - len(self.threads)):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _next_job(self):
+        # Round-robin over teams with queued work
+        while self.order:
+            team = self.order.popleft()
+            queue = self.queues.get(team)
+            if not queue:
+                self.queues.pop(team, None)
+                continue
+            job = queue.popleft()
+            if queue:
+                self.order.append(team)
+            else:
+                del self.queues[team]
+            return job
+        return None
+
+    def _work(self):
+        while True:
+            with self.lock:
+                job = self._next_job()
+                while job is None:
+                    self.lock.wait()
+                    job = self._next_job()
+                waited = time.monotonic() - job[0]
+                self.queue_wait_time += waited
+                self.max_queue_wait = max(self.max_queue_wait, waited)
+            _queued_at, future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def submit(self, fn, *args, team=None):
+        future = Future()
+        with self.lock:
+            if team not in self.queues:
+                self.queues[team] = deque()
+                self.order.append(team)
+            self.queues[team].append((time.monotonic(), future, fn, args))
+            self.submitted += 1
+            self._ensure_workers()
+            self.lock.notify()
+        return future
+
+    def fetch_many(self, usernames, fetch_batch, chunk_size, team=None):
+        # fetch_batch(chunk) -> {username: data}. Returns {username: Future};
+        # usernames already in flight reuse the pending future.
+        futures = {}
+        new = []
+        with self.lock:
+            for username in dict.fromkeys(usernames):
+                if username in self.inflight:
+                    futures[username] = self.inflight[username]
+                    self.deduplicated += 1
+                else:
+                    futures[username] = self.inflight[username] = Future()
+                    new.append(username)
+        for i in range(0, len(new), chunk_size):
+            chunk = new[i:i + chunk_size]
+            job = self.submit(fetch_batch, chunk, team=team)
+            job.add_done_callback(lambda job, chunk=chunk: self._resolve(job, chunk))
+        return futures
+
+    def _resolve(self, job, chunk):
+        error = job.exception()
+        results = {} if error else (job.result() or {})
+        with self.lock:
+            pending = [(u, self.inflight.pop(u)) for u in chunk]
+        for username, future in pending:
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(username))
+
+    def stats(self):
+        with self.lock:
+            return {
+                "queue_depth": sum(len(q) for q in self.queues.values()),
+                "queued_teams": len(self.queues),
+                "inflight_usernames": len(self.inflight),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "queue_wait_time": self.queue_wait_time,
+                "max_queue_wait": self.max_queue_wait,
+            }
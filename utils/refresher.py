@@ -0,0 +1,86 @@
+import math
+import threading
+import time
+
+from utils import activity, cache, catalog
+from utils.leetcodeapi import schedule_users_data
+from utils.storage import load_all_members
+
+# Seconds between refresh cycles, and the age at which a cached profile is
+# due for a refresh. Keeping REFRESH_AFTER below cache.CACHE_TTL means page
+# loads almost always find a fresh entry.
+REFRESH_INTERVAL = 5 * 60
+REFRESH_AFTER = 10 * 60
+
+# Upper bound on profiles refreshed per cycle so one cycle never monopolises
+# the shared rate budget; the rest wait for the next cycle.
+MAX_PER_CYCLE = 200
+
+# Scheduler queue used for refresher traffic, separate from team sessions
+REFRESH_TEAM = "__refresher__"
+
+def tracked_usernames():
+    usernames = []
+    for members in load_all_members().values():
+        usernames.extend(m["username"] for m in members)
+    return list(dict.fromkeys(usernames))
+
+def refresh_order(usernames, metadata, refresh_after=REFRESH_AFTER):
+    # Never-fetched profiles first, then by staleness weighted by views
+    due = []
+    for username in usernames:
+        age, views = metadata.get(username, (None, 0))
+        if age is None:
+            due.append((math.inf, username))
+        elif age >= refresh_after:
+            due.append((age * (1 + math.log1p(views)), username))
+    due.sort(reverse=True)
+    return [username for _, username in due]
+
+def refresh_once(max_profiles=None, refresh_after=None):
+    # Returns (refreshed, failed) username lists
+    max_profiles = MAX_PER_CYCLE if max_profiles is None else max_profiles
+    refresh_after = REFRESH_AFTER if refresh_after is None else refresh_after
+    order = refresh_order(tracked_usernames(), cache.cache_metadata(), refresh_after)
+    batch = order[:max_profiles]
+    if not batch:
+        return [], []
+    results = schedule_users_data(batch, team=REFRESH_TEAM)
+    cache.write_cache(results)
+    refreshed = [u for u in batch if results.get(u) is not None]
+    failed = [u for u in batch if results.get(u) is None]
+    return refreshed, failed
+
+def sync_activity_once(max_profiles=None):
+    # Activity sync for tracked members whose cached totals moved since their
+    # last sync (or who were never synced); returns activity.sync_profiles stats
+    max_profiles = MAX_PER_CYCLE if max_profiles is None else max_profiles
+    profiles = {u: data for u, (data, _age) in cache.read_cache(tracked_usernames()).items()}
+    due = activity.due_for_sync(profiles)[:max_profiles]
+    return activity.sync_profiles({u: profiles[u] for u in due}, team=REFRESH_TEAM, force=True)
+
+def run_forever(interval=REFRESH_INTERVAL, stop_event=None, log=None):
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        start = time.monotonic()
+        try:
+            refreshed, failed = refresh_once()
+            synced = sync_activity_once()
+            catalog.sync_catalog()
+            if log:
+                log(f"refreshed {len(refreshed)} profiles, {len(failed)} failed, "
+                    f"synced activity for {synced['members']} "
+                    f"in {time.monotonic() - start:.1f}s")
+        except Exception as e:
+            if log:
+                log(f"refresh cycle failed: {e}")
+        stop_event.wait(interval)
+
+def start_refresher(interval=REFRESH_INTERVAL):
+    # In-process refresher thread; returns the Event that stops it
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=run_forever, args=(interval, stop_event), daemon=True, name="leetcode-refresher"
+    )
+    thread.start()
+    return stop_event
@@ -0,0 +1,90 @@
+import time
+
+from utils import db
+
+# Append-only history of fetched profiles. A snapshot is only written when a
+# member's counts or ranking changed since their previous one, so a member who
+# is idle for months costs no rows; readers carry the last value forward.
+# The table and its (username, taken_at) index are created in utils.db.
+
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+
+def snapshot_row(profile):
+    # profile: MemberProfile
+    return (profile.solved, profile.easy, profile.medium, profile.hard, profile.ranking)
+
+def record_snapshots(conn, profiles, taken_at=None):
+    # profiles: {username: profile}. Runs inside the caller's transaction.
+    taken_at = time.time() if taken_at is None else taken_at
+    rows = []
+    for username, profile in profiles.items():
+        if profile is None:
+            continue
+        row = snapshot_row(profile)
+        latest = conn.execute(
+            "SELECT total_solved, easy, medium, hard, ranking FROM snapshots "
+            "WHERE username = ? ORDER BY taken_at DESC LIMIT 1",
+            (username,),
+        ).fetchone()
+        if latest != row:
+            rows.append((username, taken_at) + row)
+    if rows:
+        conn.executemany(
+            "INSERT INTO snapshots (username, taken_at, total_solved, easy, medium, hard, ranking) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+def solved_since(usernames, since):
+    # {username: problems solved since `since`}. Members whose history starts
+    # after `since` are measured from their first snapshot.
+    gains = {}
+    with db.transaction() as conn:
+        for username in dict.fromkeys(usernames):
+            latest = conn.execute(
+                "SELECT total_solved FROM snapshots WHERE username = ? "
+                "ORDER BY taken_at DESC LIMIT 1",
+                (username,),
+            ).fetchone()
+            if latest is None:
+                continue
+            base = conn.execute(
+                "SELECT total_solved FROM snapshots WHERE username = ? AND taken_at <= ? "
+                "ORDER BY taken_at DESC LIMIT 1",
+                (username, since),
+            ).fetchone() or conn.execute(
+                "SELECT total_solved FROM snapshots WHERE username = ? "
+                "ORDER BY taken_at ASC LIMIT 1",
+                (username,),
+            ).fetchone()
+            gains[username] = latest[0] - base[0]
+    return gains
+
+def history(usernames, since, until=None, resolution=DAY):
+    # [(username, timestamp, total, easy, medium, hard)] with at most one point
+    # per member per `resolution` seconds (the last one in each bucket). Each
+    # member also gets a point at `since` carrying their earlier value forward.
+    until = time.time() if until is None else until
+    points = []
+    with db.transaction() as conn:
+        for username in dict.fromkeys(usernames):
+            base = conn.execute(
+                "SELECT total_solved, easy, medium, hard FROM snapshots "
+                "WHERE username = ? AND taken_at <= ? ORDER BY taken_at DESC LIMIT 1",
+                (username, since),
+            ).fetchone()
+            if base:
+                points.append((username, since) + base)
+            rows = conn.execute(
+                "SELECT MAX(taken_at), total_solved, easy, medium, hard FROM snapshots "
+                "WHERE username = ? AND taken_at > ? AND taken_at <= ? "
+                "GROUP BY CAST(taken_at / ? AS INTEGER) ORDER BY 1",
+                (username, since, until, resolution),
+            ).fetchall()
+            points.extend((username,) + row for row in rows)
+            if points and points[-1][0] == username and points[-1][1] < until:
+                # Extend the line to `until` so idle members show as flat
+                points.append((username, until) + points[-1][2:])
+    return points
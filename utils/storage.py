@@ -0,0 +1,111 @@
+from utils import db, json_store, metrics
+
+# "sqlite" keeps users, teams and members in data/leetcode_dashboard.db;
+# "json" keeps the original members.json / users.json files.
+STORAGE_BACKEND = "sqlite"
+
+# Constants
+DATA_PATH = "data/members.json"
+USER_PATH = "data/users.json"
+
+_imported = False
+
+def _use_sqlite():
+    # The first SQLite access per process imports the JSON files once
+    global _imported
+    if STORAGE_BACKEND != "sqlite":
+        return False
+    if not _imported:
+        db.import_json(DATA_PATH, USER_PATH)
+        _imported = True
+    return True
+
+# Load all teams/members data
+@metrics.instrument("load_members")
+def load_all_members():
+    if _use_sqlite():
+        return db.get_all_members()
+    return json_store.load(DATA_PATH)
+
+# Get current user's members
+@metrics.instrument("load_members")
+def load_members(user):
+    if _use_sqlite():
+        return db.get_members(user)
+    return json_store.load(DATA_PATH).get(user, [])
+
+def save_members(user, members):
+    if _use_sqlite():
+        db.replace_members(user, members)
+        return
+    def replace(all_members):
+        all_members[user] = members
+    json_store.update(DATA_PATH, replace)
+
+def add_member(user, name, username):
+    # False if the username is already on the team
+    if _use_sqlite():
+        return db.add_member(user, name, username)
+    def add(all_members):
+        members = all_members.setdefault(user, [])
+        if any(m["username"] == username for m in members):
+            return False
+        members.append({"name": name, "username": username})
+        return True
+    return json_store.update(DATA_PATH, add)
+
+def add_members(user, members):
+    # Single write for a batch of {"name", "username"} dicts; returns the
+    # usernames actually added (existing members are skipped)
+    if _use_sqlite():
+        return db.add_members(user, members)
+    def add(all_members):
+        team = all_members.setdefault(user, [])
+        existing = {m["username"] for m in team}
+        added = []
+        for member in members:
+            if member["username"] not in existing:
+                team.append({"name": member.get("name", member["username"]), "username": member["username"]})
+                existing.add(member["username"])
+                added.append(member["username"])
+        return added if added else False
+    return json_store.update(DATA_PATH, add) or []
+
+def remove_member(user, username):
+    if _use_sqlite():
+        return db.remove_member(user, username)
+    def remove(all_members):
+        members = all_members.get(user, [])
+        remaining = [m for m in members if m["username"] != username]
+        if len(remaining) == len(members):
+            return False
+        all_members[user] = remaining
+        return True
+    return json_store.update(DATA_PATH, remove)
+
+# --- Users ---
+
+def get_password_hash(username):
+    if _use_sqlite():
+        return db.get_password_hash(username)
+    return json_store.load(USER_PATH).get(username)
+
+def create_user(username, password_hash):
+    # False if the username is taken
+    if _use_sqlite():
+        return db.create_user(username, password_hash)
+    def create(users):
+        if username in users:
+            return False
+        users[username] = password_hash
+        return True
+    return json_store.update(USER_PATH, create)
+
+def set_password_hash(username, password_hash):
+    if _use_sqlite():
+        db.set_password_hash(username, password_hash)
+        return
+    def update(users):
+        if username in users:
+            users[username] = password_hash
+    json_store.update(USER_PATH, update)
@@ -0,0 +1,233 @@
+import csv
+import json
+import os
+
+from utils import db, storage
+from utils.profile import decode
+from utils.snapshots import snapshot_row
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV only
+    pa = None
+    pq = None
+
+# Streaming export/import of team stats. Rows are written and read in
+# batches of BATCH_SIZE so neither direction holds the full dataset.
+
+BATCH_SIZE = 5000
+
+PROFILE_FIELDS = [
+    ("team", "string"), ("username", "string"), ("name", "string"),
+    ("totalSolved", "int64"), ("easy", "int64"), ("medium", "int64"), ("hard", "int64"),
+    ("ranking", "int64"), ("last_updated", "string"), ("data", "string"),
+]
+SNAPSHOT_FIELDS = [
+    ("username", "string"), ("taken_at", "float64"), ("total_solved", "int64"),
+    ("easy", "int64"), ("medium", "int64"), ("hard", "int64"), ("ranking", "int64"),
+]
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+def default_format():
+    return "parquet" if pa is not None else "csv"
+
+def format_for(path):
+    for fmt, extension in FORMATS.items():
+        if path.endswith(extension):
+            return fmt
+    raise ValueError(f"unknown file type: {path}")
+
+class _Writer:
+    def __init__(self, path, fields, fmt):
+        if fmt != "csv" and pa is None:
+            raise RuntimeError("pyarrow is required for parquet/arrow; use --format csv")
+        self.fmt = fmt
+        self.names = [name for name, _type in fields]
+        self.rows = 0
+        if fmt == "csv":
+            self.file = open(path, "w", newline="")
+            self.csv = csv.writer(self.file)
+            self.csv.writerow(self.names)
+        else:
+            self.schema = pa.schema([(name, getattr(pa, type_)()) for name, type_ in fields])
+            if fmt == "parquet":
+                self.writer = pq.ParquetWriter(path, self.schema)
+            else:
+                self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, rows):
+        if not rows:
+            return
+        self.rows += len(rows)
+        if self.fmt == "csv":
+            self.csv.writerows([[row.get(n) for n in self.names] for row in rows])
+        else:
+            columns = {n: [row.get(n) for row in rows] for n in self.names}
+            self.writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        if self.fmt == "csv":
+            self.file.close()
+        else:
+            self.writer.close()
+
+def _read_batches(path, fields):
+    fmt = format_for(path)
+    if fmt == "csv":
+        types = dict(fields)
+        with open(path, newline="") as f:
+            batch = []
+            for row in csv.DictReader(f):
+                for name, value in row.items():
+                    if value == "":
+                        row[name] = None
+                    elif types.get(name) == "int64":
+                        row[name] = int(float(value))
+                    elif types.get(name) == "float64":
+                        row[name] = float(value)
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        return
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read parquet/arrow files")
+    if fmt == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE):
+            yield batch.to_pylist()
+    else:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pylist()
+
+# --- Export ---
+
+def _profile_rows(all_members):
+    # Yields batches of profile rows, one cache query per batch of usernames
+    pending = []
+    for team, members in all_members.items():
+        for member in members:
+            pending.append((team, member))
+            if len(pending) >= BATCH_SIZE:
+                yield _join_profiles(pending)
+                pending = []
+    if pending:
+        yield _join_profiles(pending)
+
+def _join_profiles(pending):
+    usernames = list(dict.fromkeys(m["username"] for _team, m in pending))
+    cached = {}
+    with db.transaction() as conn:
+        for i in range(0, len(usernames), 500):
+            chunk = usernames[i:i + 500]
+            cached.update({
+                username: (data, last_updated)
+                for username, data, last_updated in conn.execute(
+                    "SELECT username, data, last_updated FROM leetcode_cache "
+                    f"WHERE username IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            })
+    rows = []
+    for team, member in pending:
+        row = {"team": team, "username": member["username"], "name": member.get("name", member["username"])}
+        entry = cached.get(member["username"])
+        if entry:
+            data, last_updated = entry
+            profile = decode(data)
+            total, easy, medium, hard, ranking = snapshot_row(profile)
+            # Exported as JSON text so files stay readable by other tools
+            row.update(totalSolved=total, easy=easy, medium=medium, hard=hard,
+                       ranking=ranking, last_updated=last_updated, data=json.dumps(profile.to_dict()))
+        rows.append(row)
+    return rows
+
+def export_all(directory, fmt=None):
+    # Writes profiles.<ext> and snapshots.<ext>; returns {path: row count}
+    fmt = fmt or default_format()
+    os.makedirs(directory, exist_ok=True)
+    extension = FORMATS[fmt]
+    written = {}
+
+    path = os.path.join(directory, "profiles" + extension)
+    writer = _Writer(path, PROFILE_FIELDS, fmt)
+    try:
+        for rows in _profile_rows(storage.load_all_members()):
+            writer.write(rows)
+    finally:
+        writer.close()
+    written[path] = writer.rows
+
+    path = os.path.join(directory, "snapshots" + extension)
+    writer = _Writer(path, SNAPSHOT_FIELDS, fmt)
+    names = [name for name, _type in SNAPSHOT_FIELDS]
+    try:
+        # A dedicated connection so the stream does not hold the shared lock
+        conn = db.connect()
+        try:
+            cursor = conn.execute(f"SELECT {', '.join(names)} FROM snapshots ORDER BY username, taken_at")
+            while True:
+                batch = cursor.fetchmany(BATCH_SIZE)
+                if not batch:
+                    break
+                writer.write([dict(zip(names, row)) for row in batch])
+        finally:
+            conn.close()
+    finally:
+        writer.close()
+    written[path] = writer.rows
+    return written
+
+# --- Import ---
+
+def import_profiles(path, with_members=False):
+    # Seeds leetcode_cache, keeping the exported last_updated so normal TTL
+    # rules decide when each profile is refreshed. Newer local entries win.
+    # Returns (profiles_seeded, members_added).
+    seeded = added = 0
+    for rows in _read_batches(path, PROFILE_FIELDS):
+        cache_rows = [
+            (row["username"], decode(row["data"]).pack(), row["last_updated"])
+            for row in rows if row.get("data")
+        ]
+        with db.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO leetcode_cache (username, data, last_updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET "
+                "data = excluded.data, last_updated = excluded.last_updated "
+                "WHERE excluded.last_updated > leetcode_cache.last_updated",
+                cache_rows,
+            )
+            seeded += conn.total_changes - before
+        if with_members:
+            for row in rows:
+                if storage.add_member(row["team"], row.get("name") or row["username"], row["username"]):
+                    added += 1
+    return seeded, added
+
+def _snapshot_values(row, names):
+    # Exports from before MemberProfile.solved doubled total_solved
+    if None not in (row.get("easy"), row.get("medium"), row.get("hard")):
+        row["total_solved"] = row["easy"] + row["medium"] + row["hard"]
+    return tuple(row.get(n) for n in names)
+
+def import_snapshots(path):
+    names = [name for name, _type in SNAPSHOT_FIELDS]
+    imported = 0
+    for rows in _read_batches(path, SNAPSHOT_FIELDS):
+        with db.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT INTO snapshots ({', '.join(names)}) "
+                f"SELECT {', '.join('?' * len(names))} "
+                "WHERE NOT EXISTS (SELECT 1 FROM snapshots WHERE username = ? AND taken_at = ?)",
+                [_snapshot_values(row, names) + (row["username"], row["taken_at"]) for row in rows],
+            )
+            imported += conn.total_changes - before
+    return imported